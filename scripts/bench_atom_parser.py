@@ -0,0 +1,49 @@
+"""Benchmark the WebSub notification parser against feedparser.
+
+Usage (from the repository root, with the usual .env in place):
+
+    python3 -m scripts.bench_atom_parser [PAYLOAD_DIR] [--number N]
+
+PAYLOAD_DIR defaults to scripts/payloads and should hold recorded hub
+notification bodies as .xml files.
+"""
+
+import argparse
+import timeit
+from pathlib import Path
+
+from src.webhook.parser import _parse_atom, _parse_feedparser, parse_notification
+
+DEFAULT_PAYLOADS = Path(__file__).parent / "payloads"
+
+
+def bench(payload_dir: Path, number: int) -> None:
+    """Time each parser on every payload and print per-call costs."""
+
+    print(f"{'payload':<28}{'parser':>14}{'feedparser':>14}{'speedup':>10}")
+    for path in sorted(payload_dir.glob("*.xml")):
+        body = path.read_bytes()
+        try:
+            _parse_atom(body)
+            fast_path = "parser"
+        except Exception:
+            # Malformed payloads exercise the feedparser fallback
+            fast_path = "parser*"
+
+        ours = timeit.timeit(lambda body=body: parse_notification(body), number=number)
+        theirs = timeit.timeit(lambda body=body: _parse_feedparser(body), number=number)
+        print(
+            f"{path.name:<28}"
+            f"{ours / number * 1e6:>12.1f}us"
+            f"{theirs / number * 1e6:>12.1f}us"
+            f"{theirs / ours:>9.1f}x"
+            + ("" if fast_path == "parser" else "  (* fell back to feedparser)")
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("payload_dir", nargs="?", type=Path, default=DEFAULT_PAYLOADS)
+    parser.add_argument("--number", type=int, default=2000, help="Iterations per payload")
+    args = parser.parse_args()
+    bench(args.payload_dir, args.number)
@@ -0,0 +1,117 @@
+"""Micro-benchmark for logger lookup and log-message formatting.
+
+Usage (from the repository root):
+
+    python3 -m scripts.bench_logging [--messages N] [--rounds R]
+
+Compares the per-message cost of the previous `LoggerMixin.logger` property,
+which called `logging.getLogger` on every access, with the class-level logger
+it now caches. It also compares eager f-string messages with lazy %-style
+arguments, both for records that are filtered out by level and for records
+that reach a handler.
+"""
+
+import argparse
+import logging
+import timeit
+
+from src.config.logging import LoggerMixin, get_logger
+
+
+class FormattingHandler(logging.Handler):
+    """Formats every record it receives and discards the result."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.format(record)
+
+
+class LegacyLoggerMixin:
+    """The mixin as it was before caching its logger, for comparison."""
+
+    @property
+    def logger(self) -> logging.Logger:
+        return get_logger(self.__class__.__name__)
+
+
+class LegacyWorker(LegacyLoggerMixin):
+    pass
+
+
+class Worker(LoggerMixin):
+    pass
+
+
+def _report(title: str, candidates: dict, messages: int, rounds: int) -> None:
+    """Time each candidate and print its per-message cost relative to the first."""
+
+    print(title)
+    baseline = None
+    for name, func in candidates.items():
+        best = min(timeit.repeat(func, number=1, repeat=rounds))
+        per_message = best / messages * 1e9
+        baseline = baseline or per_message
+        print(f"  {name:<26}{per_message:>10.1f}ns/message{baseline / per_message:>8.2f}x")
+
+
+def bench(messages: int, rounds: int) -> None:
+    """Time logger lookup and message formatting over a batch of log calls."""
+
+    # Route the benchmark loggers to a handler that formats without doing I/O
+    root = logging.getLogger("youtube_websub")
+    root.handlers = [FormattingHandler()]
+    root.propagate = False
+    root.setLevel(logging.INFO)
+
+    legacy, worker = LegacyWorker(), Worker()
+    video_id, receives = "CyYZ3adwboc", 3
+    batch = range(messages)
+
+    _report(
+        "Logger lookup:",
+        {
+            "property (getLogger)": lambda: [legacy.logger for _ in batch],
+            "cached class attribute": lambda: [worker.logger for _ in batch],
+        },
+        messages,
+        rounds,
+    )
+    _report(
+        "Filtered DEBUG message:",
+        {
+            "legacy + f-string": lambda: [
+                legacy.logger.debug(f"Processing {video_id} (receive {receives})") for _ in batch
+            ],
+            "cached + f-string": lambda: [
+                worker.logger.debug(f"Processing {video_id} (receive {receives})") for _ in batch
+            ],
+            "cached + lazy": lambda: [
+                worker.logger.debug("Processing %s (receive %s)", video_id, receives) for _ in batch
+            ],
+        },
+        messages,
+        rounds,
+    )
+    _report(
+        "Emitted INFO message:",
+        {
+            "legacy + f-string": lambda: [
+                legacy.logger.info(f"Processed {video_id} (receive {receives})") for _ in batch
+            ],
+            "cached + f-string": lambda: [
+                worker.logger.info(f"Processed {video_id} (receive {receives})") for _ in batch
+            ],
+            "cached + lazy": lambda: [
+                worker.logger.info("Processed %s (receive %s)", video_id, receives) for _ in batch
+            ],
+        },
+        messages,
+        rounds,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=100000, help="Log calls per batch")
+    parser.add_argument("--rounds", type=int, default=5, help="Batches timed per variant")
+    args = parser.parse_args()
+    bench(args.messages, args.rounds)
@@ -0,0 +1,135 @@
+"""Micro-benchmark for VideoTransformer.
+
+Usage (from the repository root):
+
+    python3 -m scripts.bench_transformer [--records N] [--rounds R]
+
+Compares the per-record cost of the previous regex-per-call implementation
+(which produced plain dicts) with `VideoTransformer.transform` and the batched
+`transform_many`, which both build validated VideoRecords. It also compares
+`model_construct` with `model_validate` for building the records themselves.
+"""
+
+import argparse
+import re
+import timeit
+from datetime import datetime
+
+from src.database.schemas import VideoRecord
+from src.worker.transformer import VideoTransformer
+
+SAMPLE_ITEM = {
+    "kind": "youtube#video",
+    "id": "CyYZ3adwboc",
+    "snippet": {
+        "publishedAt": "2025-11-20T17:00:06Z",
+        "channelId": "UCXuqSBlHAE6Xw-yeJA0Tunw",
+        "title": "This GPU   Shouldn't Exist\u0007",
+        "description": "Thanks to our sponsor!\n\n" + "Chapters and links below.\r\n" * 40,
+        "thumbnails": {
+            "default": {"url": "https://i.ytimg.com/vi/CyYZ3adwboc/default.jpg"},
+            "high": {"url": "https://i.ytimg.com/vi/CyYZ3adwboc/hqdefault.jpg"},
+            "maxres": {"url": "https://i.ytimg.com/vi/CyYZ3adwboc/maxresdefault.jpg"},
+        },
+        "channelTitle": "Linus Tech Tips",
+        "tags": [f"tag{i}" for i in range(30)],
+        "categoryId": "28",
+        "liveBroadcastContent": "none",
+    },
+    "contentDetails": {"duration": "PT18M52S"},
+    "statistics": {"viewCount": "1204933", "likeCount": "48211", "commentCount": "3120"},
+}
+
+
+class LegacyTransformer:
+    """The transformer as it was before precompiling its patterns, for comparison."""
+
+    @staticmethod
+    def transform(video_data: dict) -> dict:
+        snippet = video_data.get("snippet", {})
+        statistics = video_data.get("statistics", {})
+        content_details = video_data.get("contentDetails", {})
+        clean = LegacyTransformer._clean_text
+        return {
+            "video_id": video_data.get("id"),
+            "title": clean(snippet.get("title", "")),
+            "description": clean(snippet.get("description", "")),
+            "published_at": datetime.fromisoformat(
+                snippet.get("publishedAt", "").replace("Z", "+00:00")
+            ),
+            "channel_id": snippet.get("channelId"),
+            "channel_title": clean(snippet.get("channelTitle", "")),
+            "view_count": int(statistics.get("viewCount", 0)),
+            "like_count": int(statistics.get("likeCount", 0)),
+            "comment_count": int(statistics.get("commentCount", 0)),
+            "duration_seconds": LegacyTransformer._parse_duration(
+                content_details.get("duration", "")
+            ),
+            "tags": snippet.get("tags", [])[:50],
+            "notification_received_at": datetime.utcnow(),
+            "last_updated_at": datetime.utcnow(),
+            "created_at": datetime.utcnow(),
+        }
+
+    @staticmethod
+    def _clean_text(text: str) -> str:
+        text = re.sub(r"[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]", "", text)
+        return re.sub(r"\s+", " ", text).strip()
+
+    @staticmethod
+    def _parse_duration(duration: str) -> int:
+        match = re.match(r"PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?", duration)
+        if not match:
+            return 0
+        return (
+            int(match.group(1) or 0) * 3600
+            + int(match.group(2) or 0) * 60
+            + int(match.group(3) or 0)
+        )
+
+
+def _report(title: str, candidates: dict, records: int, rounds: int) -> None:
+    """Time each candidate and print its per-record cost relative to the first."""
+
+    print(title)
+    baseline = None
+    for name, func in candidates.items():
+        best = min(timeit.repeat(func, number=1, repeat=rounds))
+        per_record = best / records * 1e6
+        baseline = baseline or per_record
+        print(f"  {name:<18}{per_record:>10.2f}us/record{baseline / per_record:>8.2f}x")
+
+
+def bench(records: int, rounds: int) -> None:
+    """Time each implementation over a batch of identical API items."""
+
+    items = [SAMPLE_ITEM] * records
+    _report(
+        "Full transform:",
+        {
+            "legacy transform": lambda: [LegacyTransformer.transform(item) for item in items],
+            "transform": lambda: [VideoTransformer.transform(item) for item in items],
+            "transform_many": lambda: VideoTransformer.transform_many(items),
+        },
+        records,
+        rounds,
+    )
+
+    fields = [record.model_dump() for record in VideoTransformer.transform_many(items)]
+    _report(
+        "VideoRecord construction only:",
+        {
+            "model_construct": lambda: [VideoRecord.model_construct(**f) for f in fields],
+            "model_validate": lambda: [VideoRecord.model_validate(f) for f in fields],
+        },
+        records,
+        rounds,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=5000, help="Records per batch")
+    parser.add_argument("--rounds", type=int, default=5, help="Batches timed per implementation")
+    args = parser.parse_args()
+    bench(args.records, args.rounds)
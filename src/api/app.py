@@ -1,13 +1,20 @@
+import asyncio
 import time
 
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 
+from src.api.quota import router as quota_router
 from src.api.schemas import HealthCheckResponse
 from src.api.subscriptions import router as subscription_router
+from src.api.videos import router as videos_router
 from src.config.logging import get_logger, setup_logging
+from src.config.metrics import CONTENT_TYPE, http_metrics_middleware, render
 from src.config.settings import get_settings
 from src.database.db import MongoDB
+from src.messaging.sqs import SQSClient
+from src.webhook.manager import WebSubManager, create_hub_client
+from src.webhook.renewal import LeaseRenewalScheduler
 
 setup_logging()
 settings = get_settings()
@@ -21,9 +28,24 @@ async def lifespan(app: FastAPI):
     # Startup event
     logger.info("Starting up FastAPI application")
     await mongodb.connect()
+    await mongodb.ensure_indexes()
+    app.state.mongodb = mongodb
+    app.state.hub_client = create_hub_client()
+    app.state.sqs = SQSClient()
+
+    stop_renewals = asyncio.Event()
+    renewal_task = None
+    if settings.websub_renewal_enabled:
+        scheduler = LeaseRenewalScheduler(WebSubManager(app.state.hub_client, mongodb), mongodb)
+        renewal_task = asyncio.create_task(scheduler.run(stop_renewals))
     yield
     # Shutdown event
     logger.info("Shutting down FastAPI application")
+    stop_renewals.set()
+    if renewal_task is not None:
+        await renewal_task
+    await app.state.hub_client.aclose()
+    await app.state.sqs.close()
     await mongodb.close()
 
 
@@ -35,6 +57,8 @@ app = FastAPI(
 )
 
 app.include_router(subscription_router)
+app.include_router(videos_router)
+app.include_router(quota_router)
 
 app.add_middleware(
     CORSMiddleware,
@@ -45,6 +69,9 @@ app.add_middleware(
 )
 
 
+app.middleware("http")(http_metrics_middleware("api"))
+
+
 @app.middleware("http")
 async def add_process_time_header(request: Request, call_next):
     """Middleware to calculate and log request processing time."""
@@ -69,6 +96,13 @@ async def add_process_time_header(request: Request, call_next):
 # async def test_consumer(payload: dict) -> dict:
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """Expose the application's metrics in the Prometheus text format."""
+
+    return Response(render(), media_type=CONTENT_TYPE)
+
+
 @app.get("/health", tags=["Health"])
 async def health_check() -> HealthCheckResponse:
     """Check the health of all the services."""
@@ -0,0 +1,25 @@
+"""Shared FastAPI dependencies."""
+
+from fastapi import Request
+
+from src.database.db import MongoDB
+from src.messaging.sqs import SQSClient
+from src.webhook.manager import WebSubManager
+
+
+def get_mongodb(request: Request) -> MongoDB:
+    """Get the application's connected MongoDB instance."""
+
+    return request.app.state.mongodb
+
+
+def get_sqs(request: Request) -> SQSClient:
+    """Get the application's pooled SQS client for the worker queue."""
+
+    return request.app.state.sqs
+
+
+def get_websub_manager(request: Request) -> WebSubManager:
+    """Get a WebSub manager that shares the application's pooled hub client."""
+
+    return WebSubManager(request.app.state.hub_client, request.app.state.mongodb)
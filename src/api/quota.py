@@ -0,0 +1,29 @@
+"""API endpoint reporting YouTube Data API quota usage."""
+
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from src.api.dependencies import get_mongodb
+from src.config.settings import get_settings
+from src.database.db import MongoDB
+from src.worker.quota import MongoQuotaStore, QuotaTracker
+
+router = APIRouter(prefix="/quota", tags=["Quota"])
+
+
+@router.get("/youtube")
+async def get_youtube_quota(mongodb: Annotated[MongoDB, Depends(get_mongodb)]) -> dict:
+    """Get today's YouTube API quota usage shared by the worker processes."""
+
+    settings = get_settings()
+    if not settings.youtube_quota_shared:
+        raise HTTPException(
+            status_code=404,
+            detail="Quota usage is only tracked per worker process; enable youtube_quota_shared.",
+        )
+
+    tracker = QuotaTracker(
+        settings.youtube_daily_quota, rate_limits={}, store=MongoQuotaStore(mongodb)
+    )
+    return await tracker.usage()
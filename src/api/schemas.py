@@ -1,3 +1,6 @@
+from datetime import datetime
+from typing import Literal
+
 from pydantic import BaseModel, Field
 
 
@@ -18,3 +21,66 @@ class HealthCheckResponse(BaseModel):
         default_factory=list, description="List of service statuses"
     )
     timestamp: float = Field(..., description="Timestamp of the health check")
+
+
+class VideoPage(BaseModel):
+    """Model representing one page of a keyset-paginated video listing."""
+
+    items: list[dict] = Field(default_factory=list, description="Videos on this page")
+    next_cursor: str | None = Field(
+        None, description="Cursor for the next page, or null on the last page"
+    )
+
+
+class BulkSubscriptionRequest(BaseModel):
+    """Model representing a bulk subscribe or unsubscribe request."""
+
+    channel_ids: list[str] = Field(
+        ..., min_length=1, max_length=5000, description="YouTube channel IDs to update"
+    )
+    mode: Literal["subscribe", "unsubscribe"] = Field(
+        "subscribe", description="Whether to subscribe or unsubscribe the channels"
+    )
+    concurrency: int | None = Field(
+        None, ge=1, le=100, description="Maximum concurrent hub requests"
+    )
+
+
+class BulkSubscriptionResponse(BaseModel):
+    """Model representing the per-channel outcome of a bulk subscription request."""
+
+    total: int = Field(..., description="Number of channels processed")
+    succeeded: int = Field(..., description="Number of channels the hub accepted")
+    failed: int = Field(..., description="Number of channels that failed")
+    results: list[dict] = Field(default_factory=list, description="Result for each channel")
+
+
+class StatsPoint(BaseModel):
+    """Model representing a video's counters at the end of one hour or day."""
+
+    bucket: datetime = Field(..., description="Start of the hour or day")
+    last_at: datetime = Field(..., description="Time of the last snapshot in the bucket")
+    samples: int = Field(..., description="Number of snapshots in the bucket")
+    view_count: int = Field(..., description="Views at the last snapshot")
+    like_count: int = Field(..., description="Likes at the last snapshot")
+    comment_count: int = Field(..., description="Comments at the last snapshot")
+
+
+class StatsGrowthResponse(BaseModel):
+    """Model representing the growth curve of a video's counters."""
+
+    video_id: str = Field(..., description="YouTube video ID")
+    granularity: Literal["hour", "day"] = Field(..., description="Bucket size of the points")
+    points: list[StatsPoint] = Field(default_factory=list, description="Points, oldest first")
+
+
+class StatsVelocityResponse(BaseModel):
+    """Model representing how fast a video's counters grew over a trailing window."""
+
+    video_id: str = Field(..., description="YouTube video ID")
+    window_hours: int = Field(..., description="Length of the trailing window")
+    first_at: datetime | None = Field(None, description="Earliest snapshot in the window")
+    last_at: datetime | None = Field(None, description="Latest snapshot in the window")
+    view_count_per_hour: float | None = Field(None, description="Views gained per hour")
+    like_count_per_hour: float | None = Field(None, description="Likes gained per hour")
+    comment_count_per_hour: float | None = Field(None, description="Comments gained per hour")
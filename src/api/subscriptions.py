@@ -1,36 +1,90 @@
 """API endpoints for managing YouTube WebSub subscriptions."""
 
-from fastapi import APIRouter
+from typing import Annotated
 
+from fastapi import APIRouter, Depends, Query
+
+from src.api.dependencies import get_sqs, get_websub_manager
+from src.api.schemas import BulkSubscriptionRequest, BulkSubscriptionResponse
 from src.config.logging import get_logger
+from src.messaging.sqs import SQSClient
 from src.webhook.manager import WebSubManager
+from src.worker.backfill import backfill_message
 
 logger = get_logger("subscription_api")
 router = APIRouter(prefix="/subscriptions", tags=["Subscriptions"])
 
 
 @router.post("/subscribe/{channel_id}")
-async def subscribe_to_channel(channel_id: str) -> dict:
+async def subscribe_to_channel(
+    channel_id: str,
+    manager: Annotated[WebSubManager, Depends(get_websub_manager)],
+    sqs: Annotated[SQSClient, Depends(get_sqs)],
+    backfill: Annotated[bool, Query(description="Also backfill the channel's uploads")] = False,
+) -> dict:
     """Subscribe to a YouTube channel's updates."""
 
-    manager = WebSubManager()
     try:
         result = await manager.subscribe(channel_id)
+        if backfill and result.get("status") != "error":
+            await sqs.send_message(backfill_message(channel_id))
+            result["backfill"] = "queued"
         return {"success": True, "data": result}
     except Exception as e:
-        logger.error(f"Subscription failed for {channel_id}")
+        logger.error(
+            f"Subscription failed for {channel_id}: {e}",
+            extra={"channel_id": channel_id, "error": str(e)},
+        )
         return {"success": False, "message": str(e)}
 
 
 @router.post("/unsubscribe/{channel_id}")
-async def unsubscribe_from_channel(channel_id: str) -> dict:
+async def unsubscribe_from_channel(
+    channel_id: str, manager: Annotated[WebSubManager, Depends(get_websub_manager)]
+) -> dict:
     """Unsubscribe from a YouTube channel's updates."""
 
-    manager = WebSubManager()
     try:
         result = await manager.unsubscribe(channel_id)
         return {"success": True, "data": result}
     except Exception as e:
-        logger.error("Unsubscription failed",
-                     channel_id=channel_id, error=str(e))
+        logger.error(
+            f"Unsubscription failed for {channel_id}: {e}",
+            extra={"channel_id": channel_id, "error": str(e)},
+        )
+        return {"success": False, "message": str(e)}
+
+
+@router.post("/bulk")
+async def bulk_update_subscriptions(
+    request: BulkSubscriptionRequest,
+    manager: Annotated[WebSubManager, Depends(get_websub_manager)],
+) -> BulkSubscriptionResponse:
+    """Subscribe or unsubscribe many channels concurrently."""
+
+    results = await manager.bulk_update(request.channel_ids, request.mode, request.concurrency)
+    failed = sum(1 for result in results if result.get("status") == "error")
+    logger.info(f"Bulk {request.mode} finished: {len(results) - failed} ok, {failed} failed")
+    return BulkSubscriptionResponse(
+        total=len(results),
+        succeeded=len(results) - failed,
+        failed=failed,
+        results=results,
+    )
+
+
+@router.post("/backfill/{channel_id}")
+async def backfill_channel(
+    channel_id: str,
+    sqs: Annotated[SQSClient, Depends(get_sqs)],
+    max_videos: Annotated[int | None, Query(ge=1, description="Stop after this many")] = None,
+    restart: Annotated[bool, Query(description="Ignore the saved checkpoint")] = False,
+) -> dict:
+    """Queue a backfill of a channel's uploaded videos for the worker."""
+
+    try:
+        await sqs.send_message(backfill_message(channel_id, max_videos, restart))
+        return {"success": True, "data": {"channel_id": channel_id, "backfill": "queued"}}
+    except Exception as e:
+        logger.error(f"Queueing backfill failed for {channel_id}: {e}")
         return {"success": False, "message": str(e)}
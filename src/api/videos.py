@@ -0,0 +1,209 @@
+"""API endpoints for querying stored videos."""
+
+import base64
+import binascii
+import json
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime, timedelta
+from typing import Annotated, Any, Literal
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from src.api.dependencies import get_mongodb
+from src.api.schemas import StatsGrowthResponse, StatsVelocityResponse, VideoPage
+from src.config.logging import get_logger
+from src.database.db import MongoDB
+from src.database.schemas import VideoRecord
+
+logger = get_logger("videos_api")
+router = APIRouter(prefix="/videos", tags=["Videos"])
+
+MAX_PAGE_SIZE = 500
+EXPORT_BATCH_SIZE = 1000
+MAX_GROWTH_DAYS = 365
+
+
+def _encode_cursor(document: dict) -> str:
+    """Encode the keyset position of a document as an opaque cursor."""
+
+    published_at = document["published_at"]
+    if isinstance(published_at, datetime):
+        published_at = published_at.isoformat()
+    raw = json.dumps([published_at, str(document["_id"])]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def _decode_cursor(cursor: str) -> dict:
+    """Decode a cursor into a query matching documents strictly after it."""
+
+    try:
+        published_at, object_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        published_at = datetime.fromisoformat(published_at)
+        object_id = ObjectId(object_id)
+    except (binascii.Error, InvalidId, TypeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail="Invalid cursor.") from e
+
+    return {
+        "$or": [
+            {"published_at": {"$lt": published_at}},
+            {"published_at": published_at, "_id": {"$lt": object_id}},
+        ]
+    }
+
+
+def _parse_fields(fields: str | None) -> dict | None:
+    """Turn a comma separated field list into a projection."""
+
+    if not fields:
+        return None
+
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = requested - VideoRecord.model_fields.keys()
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    # published_at is always needed to build the next cursor
+    return dict.fromkeys(requested | {"video_id", "published_at"}, 1)
+
+
+def _json_default(value: Any) -> str:
+    """Serialize BSON values that json does not handle natively."""
+
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def video_filters(
+    channel_id: str | None = None,
+    published_after: datetime | None = None,
+    published_before: datetime | None = None,
+    min_duration: Annotated[int | None, Query(ge=0, description="In seconds")] = None,
+    max_duration: Annotated[int | None, Query(ge=0, description="In seconds")] = None,
+    tags: Annotated[list[str] | None, Query(description="Videos must have all tags")] = None,
+) -> dict:
+    """Build a MongoDB query from the video filter query parameters."""
+
+    query: dict[str, Any] = {}
+    if channel_id:
+        query["channel_id"] = channel_id
+    if published_after or published_before:
+        query["published_at"] = {}
+        if published_after:
+            query["published_at"]["$gte"] = published_after
+        if published_before:
+            query["published_at"]["$lt"] = published_before
+    if min_duration is not None or max_duration is not None:
+        query["duration_seconds"] = {}
+        if min_duration is not None:
+            query["duration_seconds"]["$gte"] = min_duration
+        if max_duration is not None:
+            query["duration_seconds"]["$lte"] = max_duration
+    if tags:
+        query["tags"] = {"$all": tags}
+    return query
+
+
+@router.get("")
+async def list_videos(
+    query: Annotated[dict, Depends(video_filters)],
+    mongodb: Annotated[MongoDB, Depends(get_mongodb)],
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = 50,
+    cursor: str | None = None,
+    fields: Annotated[str | None, Query(description="Comma separated fields")] = None,
+) -> VideoPage:
+    """List videos newest first using keyset (cursor) pagination."""
+
+    projection = _parse_fields(fields)
+    if cursor:
+        query = {"$and": [query, _decode_cursor(cursor)]} if query else _decode_cursor(cursor)
+
+    # Fetch one extra document to know whether another page exists
+    documents = await mongodb.find_videos(query, projection, limit + 1).to_list(length=limit + 1)
+    has_more = len(documents) > limit
+    documents = documents[:limit]
+    next_cursor = _encode_cursor(documents[-1]) if has_more else None
+
+    for document in documents:
+        document.pop("_id", None)
+    return VideoPage(items=documents, next_cursor=next_cursor)
+
+
+@router.get("/export")
+async def export_videos(
+    query: Annotated[dict, Depends(video_filters)],
+    mongodb: Annotated[MongoDB, Depends(get_mongodb)],
+    fields: Annotated[str | None, Query(description="Comma separated fields")] = None,
+) -> StreamingResponse:
+    """Stream every matching video as newline delimited JSON."""
+
+    projection = _parse_fields(fields) or {}
+    projection["_id"] = 0
+    cursor = mongodb.find_videos(query, projection).batch_size(EXPORT_BATCH_SIZE)
+
+    async def stream() -> AsyncIterator[str]:
+        async for document in cursor:
+            yield json.dumps(document, default=_json_default) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+@router.get("/{video_id}/stats/growth", response_model=StatsGrowthResponse)
+async def get_video_growth(
+    video_id: str,
+    mongodb: Annotated[MongoDB, Depends(get_mongodb)],
+    granularity: Literal["hour", "day"] = "hour",
+    since: Annotated[datetime | None, Query(description="Start of the range")] = None,
+    until: Annotated[datetime | None, Query(description="End of the range")] = None,
+) -> StatsGrowthResponse:
+    """Get the growth curve of a video's counters from the hourly rollups.
+
+    Naive datetimes are taken as UTC. The range defaults to the last 7 days
+    for hourly points and the last 90 days for daily points.
+    """
+
+    until = until.replace(tzinfo=until.tzinfo or UTC) if until else datetime.now(UTC)
+    if since is None:
+        since = until - timedelta(days=7 if granularity == "hour" else 90)
+    since = since.replace(tzinfo=since.tzinfo or UTC)
+    if since > until:
+        raise HTTPException(status_code=400, detail="'since' must not be after 'until'.")
+    if until - since > timedelta(days=MAX_GROWTH_DAYS):
+        raise HTTPException(
+            status_code=400, detail=f"Range must not exceed {MAX_GROWTH_DAYS} days."
+        )
+
+    points = await mongodb.get_stats_growth(video_id, since, until, granularity)
+    return StatsGrowthResponse(video_id=video_id, granularity=granularity, points=points)
+
+
+@router.get("/{video_id}/stats/velocity", response_model=StatsVelocityResponse)
+async def get_video_velocity(
+    video_id: str,
+    mongodb: Annotated[MongoDB, Depends(get_mongodb)],
+    window_hours: Annotated[int, Query(ge=1, le=24 * 30)] = 24,
+) -> StatsVelocityResponse:
+    """Get how many views, likes and comments a video gained per hour recently."""
+
+    velocity = await mongodb.get_stats_velocity(video_id, timedelta(hours=window_hours))
+    if velocity is None:
+        raise HTTPException(status_code=404, detail="No statistics recorded in this window.")
+    return StatsVelocityResponse(video_id=video_id, window_hours=window_hours, **velocity)
+
+
+@router.get("/{video_id}")
+async def get_video(
+    video_id: str,
+    mongodb: Annotated[MongoDB, Depends(get_mongodb)],
+    fields: Annotated[str | None, Query(description="Comma separated fields")] = None,
+) -> dict:
+    """Get a single video by its YouTube video ID."""
+
+    projection = _parse_fields(fields) or {}
+    projection["_id"] = 0
+    document = await mongodb.videos.find_one({"video_id": video_id}, projection)
+    if document is None:
+        raise HTTPException(status_code=404, detail="Video not found.")
+    return document
@@ -1,14 +1,179 @@
+"""Application logging.
+
+Loggers never write from the calling thread: `setup_logging` gives each
+configured logger a QueueHandler, and a QueueListener thread runs the console
+and file handlers. A `logger.info` on the event loop only formats the message
+and puts the record on a queue.
+
+`JsonFormatter` writes one JSON object per record, including any fields
+passed with `extra=`. `SamplingFilter` keeps only a fraction of the DEBUG and
+INFO records of high-volume loggers; warnings and errors are always kept.
+"""
+
+import atexit
+import json
 import logging
 import logging.config
+import logging.handlers
 import os
-from datetime import datetime
+import queue
+import random
+from datetime import UTC, datetime
 from typing import Any
 
 from .settings import get_settings
 
+# Attributes every LogRecord has; anything else on a record came from `extra=`
+_RECORD_ATTRIBUTES = frozenset(logging.LogRecord("", 0, "", 0, "", None, None).__dict__) | {
+    "message",
+    "asctime",
+    "taskName",
+}
+
+_listeners: list[logging.handlers.QueueListener] = []
+
+# Suffix of this process's log file names, so processes never share a file
+_file_tag: str | None = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as one JSON object per line, including `extra=` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, UTC).isoformat(),
+            "logger": record.name,
+            "level": record.levelname,
+            "file": record.filename,
+            "line": record.lineno,
+            "function": record.funcName,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a fraction of the DEBUG and INFO records of selected loggers.
+
+    Rates are keyed by logger name, with or without the `youtube_websub.`
+    prefix, and apply to child loggers too; the most specific name wins.
+    """
+
+    def __init__(self, rates: dict[str, float]) -> None:
+        super().__init__()
+        self.rates = rates
+        self._resolved: dict[str, float] = {}
+
+    def _rate(self, name: str) -> float:
+        rate = self._resolved.get(name)
+        if rate is None:
+            rate = 1.0
+            candidate = name
+            while candidate:
+                short = candidate.removeprefix("youtube_websub.")
+                if candidate in self.rates or short in self.rates:
+                    rate = self.rates.get(candidate, self.rates.get(short, 1.0))
+                    break
+                candidate = candidate.rpartition(".")[0]
+            self._resolved[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate(record.name)
+        return rate >= 1 or random.random() < rate
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Queues records for the listener thread without blocking on a full queue.
+
+    When the queue is full, DEBUG and INFO records are dropped; warnings and
+    errors wait for room.
+    """
+
+    def __init__(self, log_queue: queue.Queue) -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge the arguments now, since they may change once the caller moves
+        # on, but leave the formatting to the handlers behind the listener
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
 
-def setup_logging() -> None:
-    """Set up application logging configuration."""
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if record.levelno >= logging.WARNING:
+                self.queue.put(record)
+            else:
+                self.dropped += 1
+
+
+def _stop_listeners() -> None:
+    """Flush the queued records and stop the listener threads."""
+
+    while _listeners:
+        _listeners.pop().stop()
+
+
+atexit.register(_stop_listeners)
+
+
+def _install_queues(
+    logger_names: list[str | None], queue_size: int, sample_rates: dict[str, float]
+) -> None:
+    """Move the handlers of the given loggers behind queues served by listener threads.
+
+    Loggers with the same handlers share one queue and one listener.
+    """
+
+    groups: dict[tuple[logging.Handler, ...], _QueueHandler] = {}
+    for name in logger_names:
+        logger = logging.getLogger(name)
+        handlers = tuple(logger.handlers)
+        if not handlers:
+            continue
+        queue_handler = groups.get(handlers)
+        if queue_handler is None:
+            queue_handler = _QueueHandler(queue.Queue(queue_size))
+            if sample_rates:
+                queue_handler.addFilter(SamplingFilter(sample_rates))
+            listener = logging.handlers.QueueListener(
+                queue_handler.queue, *handlers, respect_handler_level=True
+            )
+            listener.start()
+            _listeners.append(listener)
+            groups[handlers] = queue_handler
+        logger.handlers = [queue_handler]
+
+
+def setup_logging(file_tag: str | None = None) -> None:
+    """Set up application logging configuration.
+
+    `file_tag` is appended to the log file names; it is remembered, so later
+    calls in the same process keep writing to the same files.
+    """
+    global _file_tag
+    if file_tag is not None:
+        _file_tag = file_tag
+    suffix = f"_{_file_tag}" if _file_tag else ""
     settings = get_settings()
 
     # Ensure logs directory exists
@@ -16,7 +181,8 @@ def setup_logging() -> None:
 
     # Create log filename with timestamp
     log_filename = os.path.join(
-        settings.logs_directory, f"youtube_websub_{datetime.now().strftime('%Y%m%d')}.log"
+        settings.logs_directory,
+        f"youtube_websub_{datetime.now().strftime('%Y%m%d')}{suffix}.log",
     )
 
     logging_config: dict[str, Any] = {
@@ -30,20 +196,13 @@ def setup_logging() -> None:
                 )
             },
             "simple": {"format": "%(asctime)s - %(levelname)s - %(message)s"},
-            "json": {
-                "format": (
-                    '{"timestamp": "%(asctime)s", "logger": "%(name)s", '
-                    '"level": "%(levelname)s", "file": "%(filename)s", '
-                    '"line": %(lineno)d, "function": "%(funcName)s", '
-                    '"message": "%(message)s"}'
-                )
-            },
+            "json": {"()": JsonFormatter},
         },
         "handlers": {
             "console": {
                 "class": "logging.StreamHandler",
                 "level": "INFO",
-                "formatter": "simple",
+                "formatter": "json" if settings.log_console_format == "json" else "simple",
                 "stream": "ext://sys.stdout",
             },
             "file": {
@@ -58,7 +217,7 @@ def setup_logging() -> None:
                 "class": "logging.handlers.RotatingFileHandler",
                 "level": "ERROR",
                 "formatter": "json",
-                "filename": os.path.join(settings.logs_directory, "errors.log"),
+                "filename": os.path.join(settings.logs_directory, f"errors{suffix}.log"),
                 "maxBytes": 10485760,  # 10MB
                 "backupCount": 5,
             },
@@ -75,7 +234,14 @@ def setup_logging() -> None:
         "root": {"level": "INFO", "handlers": ["console", "file"]},
     }
 
+    # Setting up again (every entry point calls this) replaces the listeners
+    _stop_listeners()
     logging.config.dictConfig(logging_config)
+    _install_queues(
+        list(logging_config["loggers"]) + [None],
+        settings.log_queue_size,
+        settings.log_sample_rates,
+    )
 
 
 def get_logger(name: str) -> logging.Logger:
@@ -84,9 +250,14 @@ def get_logger(name: str) -> logging.Logger:
 
 
 class LoggerMixin:
-    """Mixin class to provide logging functionality."""
+    """Mixin class to provide logging functionality.
+
+    Each subclass gets its logger once, as a class attribute, so `self.logger`
+    is a plain attribute lookup instead of a `logging.getLogger` call.
+    """
+
+    logger: logging.Logger
 
-    @property
-    def logger(self) -> logging.Logger:
-        """Get logger for this class."""
-        return get_logger(self.__class__.__name__)
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls.logger = get_logger(cls.__name__)
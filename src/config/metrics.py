@@ -0,0 +1,343 @@
+"""Prometheus-style metrics.
+
+A small in-process implementation of counters, gauges and histograms that
+renders the Prometheus text exposition format, so no client library is
+needed. Metrics are created once at import time in this module and updated
+from the hot paths; `render()` produces the body served at `/metrics`.
+
+Worker children run in their own processes, so they send `collect()` output
+to the supervisor, which renders every child's samples with a `worker` label.
+"""
+
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from typing import TypeVar
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Latency buckets in seconds, from sub-millisecond hot paths to slow API calls
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# A family is (name, type, help, [(sample name, labels, value), ...])
+Family = tuple[str, str, str, list[tuple[str, dict[str, str], float]]]
+
+
+class _Metric(ABC):
+    """Base class holding one value per combination of label values."""
+
+    TYPE = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: tuple[str, ...]) -> dict[str, str]:
+        return dict(zip(self.labelnames, key, strict=True))
+
+    @abstractmethod
+    def collect(self) -> Family:
+        """Get the family of samples of this metric."""
+
+
+class Counter(_Metric):
+    """A value that only goes up."""
+
+    TYPE = "counter"
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        """Increase the counter of the given label values."""
+
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def collect(self) -> Family:
+        with self._lock:
+            samples = [
+                (f"{self.name}_total", self._labels(key), value)
+                for key, value in self._values.items()
+            ]
+        return self.name, self.TYPE, self.documentation, samples
+
+
+class Gauge(_Metric):
+    """A value that can go up and down."""
+
+    TYPE = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        """Set the gauge of the given label values."""
+
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        """Increase the gauge of the given label values."""
+
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        """Decrease the gauge of the given label values."""
+
+        self.inc(-amount, **labels)
+
+    def collect(self) -> Family:
+        with self._lock:
+            samples = [(self.name, self._labels(key), value) for key, value in self._values.items()]
+        return self.name, self.TYPE, self.documentation, samples
+
+
+class Histogram(_Metric):
+    """Counts observations into cumulative buckets, with their sum and count."""
+
+    TYPE = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record one observation for the given label values."""
+
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            counts = state[0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the duration of the wrapped block in seconds."""
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def collect(self) -> Family:
+        samples = []
+        with self._lock:
+            for key, (counts, total, count) in self._values.items():
+                labels = self._labels(key)
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts, strict=True):
+                    cumulative += bucket_count
+                    samples.append(
+                        (f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative)
+                    )
+                samples.append((f"{self.name}_bucket", {**labels, "le": "+Inf"}, count))
+                samples.append((f"{self.name}_sum", labels, total))
+                samples.append((f"{self.name}_count", labels, count))
+        return self.name, self.TYPE, self.documentation, samples
+
+
+MetricT = TypeVar("MetricT", bound=_Metric)
+
+
+class Registry:
+    """The set of metrics rendered together."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: MetricT) -> MetricT:
+        """Add a metric, rejecting duplicate names."""
+
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered.")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def collect(self) -> list[Family]:
+        """Get the families of every metric that has samples."""
+
+        families = [metric.collect() for metric in self._metrics.values()]
+        return [family for family in families if family[3]]
+
+
+REGISTRY = Registry()
+
+
+def counter(name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+    """Create and register a counter."""
+
+    return REGISTRY.register(Counter(name, documentation, labelnames))
+
+
+def gauge(name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+    """Create and register a gauge."""
+
+    return REGISTRY.register(Gauge(name, documentation, labelnames))
+
+
+def histogram(
+    name: str,
+    documentation: str,
+    labelnames: Iterable[str] = (),
+    buckets: Iterable[float] = DEFAULT_BUCKETS,
+) -> Histogram:
+    """Create and register a histogram."""
+
+    return REGISTRY.register(Histogram(name, documentation, labelnames, buckets))
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return f"{value:.1f}"
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def render(
+    families: Iterable[Family] | None = None, extra_labels: dict[str, str] | None = None
+) -> str:
+    """Render families in the text exposition format; defaults to this process's metrics."""
+
+    return render_many([(families if families is not None else REGISTRY.collect(), extra_labels)])
+
+
+def render_many(sources: Iterable[tuple[Iterable[Family], dict[str, str] | None]]) -> str:
+    """Render the families of several processes, each with its own extra labels.
+
+    Families with the same name are merged under one HELP and TYPE header.
+    """
+
+    merged: dict[str, tuple[str, str, list[str]]] = {}
+    for families, extra_labels in sources:
+        for name, metric_type, documentation, samples in families:
+            lines = merged.setdefault(name, (metric_type, documentation, []))[2]
+            for sample_name, labels, value in samples:
+                all_labels = {**(extra_labels or {}), **labels}
+                label_text = ",".join(f'{key}="{_escape(v)}"' for key, v in all_labels.items())
+                label_text = f"{{{label_text}}}" if label_text else ""
+                lines.append(f"{sample_name}{label_text} {_format_value(value)}")
+
+    output = []
+    for name, (metric_type, documentation, lines) in merged.items():
+        output.append(f"# HELP {name} {documentation}")
+        output.append(f"# TYPE {name} {metric_type}")
+        output.extend(lines)
+    return "\n".join(output) + "\n"
+
+
+def http_metrics_middleware(app_name: str):
+    """Build an HTTP middleware recording request counts and latency per route.
+
+    Routes are labelled with their path template (e.g. `/videos/{video_id}`)
+    so per-ID paths do not create a series each.
+    """
+
+    async def middleware(request, call_next):
+        start = time.perf_counter()
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            route = request.scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            HTTP_REQUESTS.inc(
+                app=app_name, method=request.method, route=route_path, status=str(status)
+            )
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - start, app=app_name, method=request.method, route=route_path
+            )
+
+    return middleware
+
+
+# HTTP
+HTTP_REQUESTS = counter(
+    "http_requests", "HTTP requests handled", ("app", "method", "route", "status")
+)
+HTTP_REQUEST_SECONDS = histogram(
+    "http_request_duration_seconds", "HTTP request latency", ("app", "method", "route")
+)
+
+# Webhook
+WEBHOOK_NOTIFICATIONS = counter(
+    "webhook_notifications", "Notifications received by the webhook, by outcome", ("outcome",)
+)
+WEBHOOK_PARSE_SECONDS = histogram("webhook_parse_seconds", "Time to parse a notification body")
+WEBHOOK_PUBLISH_BUFFERED = gauge(
+    "webhook_publish_buffered", "Notifications waiting to be sent to SQS"
+)
+
+# SQS
+SQS_REQUEST_SECONDS = histogram(
+    "sqs_request_duration_seconds", "SQS API call latency", ("operation",)
+)
+SQS_MESSAGES = counter(
+    "sqs_messages", "Messages handled by SQS API calls", ("operation", "outcome")
+)
+
+# Worker
+WORKER_MESSAGES = counter(
+    "worker_messages", "Queue messages finished by the worker, by outcome", ("outcome",)
+)
+WORKER_MESSAGE_SECONDS = histogram(
+    "worker_message_duration_seconds", "Time to process one queue message"
+)
+WORKER_IN_FLIGHT = gauge("worker_in_flight_messages", "Queue messages being processed")
+TRANSFORM_SECONDS = histogram(
+    "transform_duration_seconds",
+    "Time to transform one video into a VideoRecord",
+    buckets=(0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.005, 0.01),
+)
+
+# YouTube Data API
+YOUTUBE_REQUESTS = counter("youtube_requests", "YouTube Data API requests", ("endpoint", "status"))
+YOUTUBE_REQUEST_SECONDS = histogram(
+    "youtube_request_duration_seconds", "YouTube Data API request latency", ("endpoint",)
+)
+YOUTUBE_QUOTA_UNITS = counter(
+    "youtube_quota_units", "YouTube Data API quota units spent", ("endpoint",)
+)
+YOUTUBE_CACHE_LOOKUPS = counter(
+    "youtube_cache_lookups",
+    "YouTube cache lookups per video or per API response, by result",
+    ("kind", "result"),
+)
+
+# MongoDB
+MONGO_BULK_WRITE_SECONDS = histogram(
+    "mongo_bulk_write_duration_seconds", "Latency of buffered bulk writes", ("collection",)
+)
+MONGO_BULK_OPERATIONS = counter(
+    "mongo_bulk_operations", "Operations written by bulk writes", ("collection", "outcome")
+)
@@ -1,7 +1,7 @@
 import os
 from functools import lru_cache
 
-from pydantic import Field
+from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings
 
 
@@ -27,10 +27,25 @@ class Settings(BaseSettings):
     google_gemini_model: str = Field(
         "gemini-2.0-pro", description="Google Gemini model to use")
 
+    # YouTube Data API
+    youtube_batch_size: int = Field(
+        50, description="Maximum video IDs coalesced into one videos.list request (max 50)")
+    youtube_batch_window_ms: int = Field(
+        50, description="How long to gather concurrent video lookups before fetching them")
+
     # Storage paths
     logs_directory: str = Field(
         "./logs", description="Directory for application logs")
 
+    # Logging
+    log_console_format: str = Field(
+        "simple", description="Console log format: 'simple' text or structured 'json'")
+    log_queue_size: int = Field(
+        10000, description="Records buffered for the logging thread; 0 means unbounded")
+    log_sample_rates: dict[str, float] = Field(
+        default_factory=dict,
+        description="Fraction of DEBUG/INFO records kept per logger name, e.g. {'webhook': 0.1}")
+
     # Webhook configuration
     webhook_domain: str = Field(
         "localhost",
@@ -44,6 +59,31 @@ class Settings(BaseSettings):
         description="Secret key for validating WebSub payload signatures (HMAC-SHA256)",
     )
 
+    websub_max_connections: int = Field(
+        50, description="Maximum pooled HTTP connections to the WebSub hub")
+    websub_bulk_concurrency: int = Field(
+        20, description="Default number of concurrent hub requests for bulk subscription updates")
+    websub_renewal_enabled: bool = Field(
+        True, description="Run the WebSub lease renewal scheduler in the API process")
+    websub_renewal_check_seconds: int = Field(
+        300, description="How often to look for subscriptions whose lease needs renewing")
+    websub_renew_before_seconds: int = Field(
+        86400, description="Renew a lease once it expires within this many seconds")
+    websub_renewal_jitter_seconds: int = Field(
+        3600, description="Maximum random delay used to spread renewals out")
+    websub_renewal_retry_seconds: int = Field(
+        3600, description="Retry a renewal that was not verified after this many seconds")
+    websub_renewal_rate: float = Field(
+        5.0, description="Maximum lease renewal requests per second sent to the hub")
+    webhook_publish_flush_ms: int = Field(
+        50, description="Maximum time a notification waits to be batch-published to the queue")
+    webhook_publish_max_buffered: int = Field(
+        10000, description="Notifications buffered for publishing before the hub is told to retry")
+    webhook_publish_retry_max_seconds: float = Field(
+        30, description="Longest backoff between attempts to publish a notification to the queue")
+    webhook_publish_retry_timeout_seconds: float = Field(
+        900, description="How long a notification is retried before it is dropped")
+
     ngrok_auth_token: str | None = Field(
         None, description="Ngrok authentication token for tunneling")
 
@@ -51,12 +91,50 @@ class Settings(BaseSettings):
     queue_provider: str = Field(
         "sqs", description="Queue provider to use (e.g., 'sqs')")
 
+    # Notification deduplication
+    dedup_cache_size: int = Field(
+        100000, description="Maximum notification keys kept in the in-process dedup cache")
+    dedup_ttl_seconds: int = Field(
+        86400, description="How long a notification key is remembered for deduplication")
+    dedup_shared_store: bool = Field(
+        False, description="Also share dedup keys between processes through MongoDB")
+
+    # Worker configuration
+    consumer_concurrency: int = Field(
+        20, description="Maximum number of SQS messages processed concurrently by a consumer")
+    consumer_drain_seconds: int = Field(
+        30, description="Seconds a stopping consumer lets in-flight messages finish")
+    worker_processes: int = Field(
+        0, description="Consumer processes run by the supervisor; 0 means one per CPU")
+    worker_health_port: int = Field(
+        8081, description="Port of the supervisor's aggregated health endpoint")
+    worker_status_interval_seconds: int = Field(
+        5, description="Seconds between status reports of supervised consumer processes")
+
     # AWS SQS
     AWS_REGION: str = Field("us-east-1", description="AWS region")
     SQS_QUEUE_URL: str = Field(..., description="AWS SQS queue URL")
+    SQS_DLQ_URL: str | None = Field(
+        None, description="AWS SQS dead-letter queue URL for messages that keep failing")
     AWS_ACCESS_KEY_ID: str = Field(..., description="AWS access key ID")
     AWS_SECRET_ACCESS_KEY: str = Field(...,
                                        description="AWS secret access key")
+    sqs_receivers: int = Field(
+        1, description="Number of concurrent SQS long-poll receivers per consumer")
+    sqs_max_pool_connections: int = Field(
+        20, description="Maximum pooled HTTP connections of the SQS client")
+    sqs_delete_flush_ms: int = Field(
+        50, description="Maximum time a processed message waits to be batch-deleted")
+    sqs_visibility_timeout_seconds: int = Field(
+        60, description="Visibility timeout of received messages, extended while they run")
+    sqs_heartbeat_seconds: int = Field(
+        20, description="Seconds between visibility extensions of a message still in progress")
+    sqs_max_receives: int = Field(
+        5, description="Receives after which a failing message is moved to the dead-letter queue")
+    sqs_retry_base_seconds: int = Field(
+        30, description="Delay before the first retry of a failed message, doubled per receive")
+    sqs_retry_max_seconds: int = Field(
+        3600, description="Longest delay before retrying a failed message")
 
     # MongoDB configuration
     MONGODB_URI: str = Field(
@@ -64,6 +142,44 @@ class Settings(BaseSettings):
     )  # Use the service name
     MONGODB_DB_NAME: str = Field(
         "youtube_websub", description="MongoDB database name")
+    video_hash_cache_size: int = Field(
+        100000, description="Videos whose static-metadata hash is cached to skip unchanged writes")
+    stats_raw_retention_days: int = Field(
+        90, description="Days raw statistics snapshots are kept; hourly rollups are kept forever")
+    youtube_daily_quota: int = Field(
+        10000, description="YouTube Data API quota units available per day")
+    youtube_quota_shared: bool = Field(
+        False, description="Account quota usage in MongoDB so all worker processes share it")
+    youtube_rate_limits: dict[str, float] = Field(
+        default_factory=lambda: {"default": 10.0, "search": 1.0},
+        description="Requests per second allowed per API endpoint; 'default' covers the rest")
+    youtube_rate_burst: int = Field(
+        10, description="Requests a rate-limited endpoint may send in a burst")
+    youtube_cache_size: int = Field(
+        10000, description="Maximum YouTube API responses kept for ETag revalidation")
+    youtube_cache_ttl_seconds: float = Field(
+        60, description="Seconds a cached YouTube API response is served without revalidation")
+    stats_refresh_enabled: bool = Field(
+        True, description="Whether the worker periodically refreshes video statistics")
+    stats_refresh_check_seconds: int = Field(
+        60, description="Seconds between statistics refresh passes")
+    stats_refresh_daily_quota: int = Field(
+        5000, description="YouTube API units per day the statistics refresh may spend")
+    stats_refresh_lease_seconds: int = Field(
+        900, description="Seconds a claimed video is skipped by other workers while refreshing")
+    mongo_bulk_max_batch: int = Field(
+        500, description="Maximum operations per buffered bulk_write")
+    mongo_bulk_flush_ms: int = Field(
+        100, description="Maximum time a buffered write waits before being flushed")
+
+    @field_validator("youtube_rate_limits")
+    @classmethod
+    def _check_rate_limits(cls, value: dict[str, float]) -> dict[str, float]:
+        """Reject rate limits that could never let a request through."""
+        for endpoint, rate in value.items():
+            if rate <= 0:
+                raise ValueError(f"Rate limit for {endpoint!r} must be positive, got {rate}")
+        return value
 
     class Config:
         env_file = ".env"
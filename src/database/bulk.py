@@ -0,0 +1,124 @@
+import asyncio
+import time
+
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from src.config.logging import LoggerMixin
+from src.config.metrics import MONGO_BULK_OPERATIONS, MONGO_BULK_WRITE_SECONDS
+from src.database.changes import DUPLICATE_KEY_ERROR
+from src.database.schemas import WriteResult
+
+
+class BulkWriter(LoggerMixin):
+    """Buffers write operations for a collection and flushes them with bulk_write.
+
+    Operations are written unordered, so one failing document does not block
+    the rest of its batch. A batch is flushed once it holds `max_batch_size`
+    operations, or `flush_interval` seconds after its first operation arrived.
+    Every submitter gets back the result of its own operation.
+
+    Operations submitted with `duplicate_key_ok` are guarded upserts for which
+    a duplicate key error means the document was already up to date; those
+    report success with `unchanged` set instead of failing.
+    """
+
+    def __init__(
+        self,
+        collection: AsyncIOMotorCollection,
+        max_batch_size: int = 500,
+        flush_interval: float = 0.1,
+    ) -> None:
+        """Initialize the writer for a single collection."""
+
+        self.collection = collection
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self._pending: list[tuple[InsertOne | UpdateOne, bool, asyncio.Future]] = []
+        self._flush_timer: asyncio.TimerHandle | None = None
+        self._flush_tasks: set[asyncio.Task] = set()
+
+    async def submit(
+        self, operation: InsertOne | UpdateOne, duplicate_key_ok: bool = False
+    ) -> WriteResult:
+        """Buffer an operation and wait for the result of the bulk write it joins."""
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((operation, duplicate_key_ok, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_timer is None:
+            self._flush_timer = loop.call_later(self.flush_interval, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        """Hand the pending operations to a bulk write task."""
+
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, []
+        task = asyncio.create_task(self._write_batch(batch))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _write_batch(
+        self, batch: list[tuple[InsertOne | UpdateOne, bool, asyncio.Future]]
+    ) -> None:
+        """Run one unordered bulk write and resolve every operation's future."""
+
+        errors: dict[int, dict] = {}
+        start = time.perf_counter()
+        try:
+            await self.collection.bulk_write(
+                [operation for operation, _, _ in batch], ordered=False
+            )
+        except BulkWriteError as e:
+            for write_error in e.details.get("writeErrors", []):
+                errors[write_error["index"]] = write_error
+        except Exception as e:
+            self.logger.error("Bulk write of %s operations failed: %s", len(batch), e)
+            errors = dict.fromkeys(range(len(batch)), {"errmsg": str(e)})
+
+        MONGO_BULK_WRITE_SECONDS.observe(
+            time.perf_counter() - start, collection=self.collection.name
+        )
+
+        failed = unchanged = 0
+        for index, (_, duplicate_key_ok, future) in enumerate(batch):
+            error = errors.get(index)
+            if error is None:
+                result = WriteResult(success=True)
+            elif duplicate_key_ok and error.get("code") == DUPLICATE_KEY_ERROR:
+                unchanged += 1
+                result = WriteResult(success=True, unchanged=True)
+            else:
+                failed += 1
+                result = WriteResult(success=False, error=error.get("errmsg", "write error"))
+            if not future.done():
+                future.set_result(result)
+
+        collection = self.collection.name
+        MONGO_BULK_OPERATIONS.inc(
+            len(batch) - failed - unchanged, collection=collection, outcome="written"
+        )
+        if unchanged:
+            MONGO_BULK_OPERATIONS.inc(unchanged, collection=collection, outcome="unchanged")
+        if failed:
+            MONGO_BULK_OPERATIONS.inc(failed, collection=collection, outcome="failed")
+            self.logger.error("Bulk write finished with %s failed operations", failed)
+
+    async def flush(self) -> None:
+        """Write everything still buffered and wait for in-flight bulk writes."""
+
+        self._flush()
+        if self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks, return_exceptions=True)
@@ -0,0 +1,116 @@
+"""Change-aware write operations for video documents.
+
+A video document is split into three groups of fields:
+
+- immutable fields, written only when the document is first inserted;
+- static metadata, rewritten only when its content hash changes;
+- volatile counters, which change on almost every re-delivery and are
+  written on their own with a small `$set`.
+
+The content hash is stored on the document, so the static update can be
+guarded in the database itself: it only matches documents whose stored hash
+differs. When the hash is unchanged that guarded upsert collides with the
+unique `video_id` index, which is reported as a duplicate key error and
+means "nothing to update".
+"""
+
+import hashlib
+import json
+from collections import OrderedDict
+
+from pymongo import UpdateOne
+
+from src.database.schemas import VideoRecord
+from src.database.stats import next_refresh_at
+
+IMMUTABLE_FIELDS = ("video_id", "channel_id", "published_at", "created_at")
+STATIC_FIELDS = (
+    "title",
+    "description",
+    "tags",
+    "duration_seconds",
+    "channel_title",
+    "thumbnail_url",
+    "category_id",
+    "live_broadcast_content",
+    "privacy_status",
+)
+VOLATILE_FIELDS = ("view_count", "like_count", "comment_count", "notification_received_at")
+
+DUPLICATE_KEY_ERROR = 11000
+
+
+def content_hash(document: dict) -> str:
+    """Hash the static metadata fields of a video document."""
+
+    payload = json.dumps([document[field] for field in STATIC_FIELDS], ensure_ascii=False)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def build_video_operations(
+    video_data: VideoRecord, known_hash: str | None
+) -> tuple[UpdateOne | None, UpdateOne, str]:
+    """Build the static and volatile updates for a video record.
+
+    Returns `(static_operation, volatile_operation, content_hash)`. The static
+    operation is None when `known_hash` shows the stored metadata is already
+    up to date, in which case only the counters need writing.
+    """
+
+    document = video_data.model_dump()
+    digest = content_hash(document)
+    volatile = {field: document[field] for field in VOLATILE_FIELDS}
+    # Fresh counters were just fetched, so the next statistics refresh can wait
+    volatile["next_stats_refresh_at"] = next_refresh_at(
+        video_data.published_at, document["last_updated_at"]
+    )
+    volatile_operation = UpdateOne({"video_id": video_data.video_id}, {"$set": volatile})
+
+    if known_hash == digest:
+        return None, volatile_operation, digest
+
+    static_operation = UpdateOne(
+        {"video_id": video_data.video_id, "content_hash": {"$ne": digest}},
+        {
+            "$set": {
+                **{field: document[field] for field in STATIC_FIELDS},
+                **volatile,
+                "content_hash": digest,
+                "last_updated_at": document["last_updated_at"],
+            },
+            "$setOnInsert": {field: document[field] for field in IMMUTABLE_FIELDS},
+        },
+        upsert=True,
+    )
+    return static_operation, volatile_operation, digest
+
+
+class ContentHashCache:
+    """LRU map of video ID to the content hash last written for it."""
+
+    def __init__(self, max_size: int = 100000) -> None:
+        """Initialize an empty cache."""
+
+        self.max_size = max_size
+        self._hashes: OrderedDict[str, str] = OrderedDict()
+
+    def get(self, video_id: str) -> str | None:
+        """Get the last known content hash of a video."""
+
+        digest = self._hashes.get(video_id)
+        if digest is not None:
+            self._hashes.move_to_end(video_id)
+        return digest
+
+    def set(self, video_id: str, digest: str) -> None:
+        """Remember the content hash stored for a video."""
+
+        self._hashes[video_id] = digest
+        self._hashes.move_to_end(video_id)
+        while len(self._hashes) > self.max_size:
+            self._hashes.popitem(last=False)
+
+    def discard(self, video_id: str) -> None:
+        """Forget the content hash of a video."""
+
+        self._hashes.pop(video_id, None)
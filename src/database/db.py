@@ -1,10 +1,19 @@
+import asyncio
+import uuid
 from collections.abc import AsyncGenerator
+from datetime import UTC, datetime, timedelta
 
-from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCursor, AsyncIOMotorDatabase
+from pymongo import DESCENDING, UpdateOne
+from pymongo.errors import BulkWriteError
 
 from src.config.logging import LoggerMixin
 from src.config.settings import get_settings
-from src.database.schemas import DatabaseResponse, VideoRecord
+from src.database.bulk import BulkWriter
+from src.database.changes import DUPLICATE_KEY_ERROR, ContentHashCache, build_video_operations
+from src.database.indexes import INDEXES, TIMESERIES_COLLECTIONS, diff_indexes
+from src.database.schemas import DatabaseResponse, VideoRecord, WriteResult
+from src.database.stats import STATS_FIELDS, build_stats_operations, hour_bucket
 
 get_settings()
 
@@ -12,6 +21,9 @@ get_settings()
 class MongoDB(LoggerMixin):
     _client: AsyncIOMotorClient | None = None
     _database: AsyncIOMotorDatabase | None = None
+    _video_writer: BulkWriter | None = None
+    _stats_writer: BulkWriter | None = None
+    _rollup_writer: BulkWriter | None = None
 
     @property
     def videos(self) -> AsyncIOMotorDatabase:
@@ -21,6 +33,14 @@ class MongoDB(LoggerMixin):
             raise ValueError("Database connection is not established.")
         return self._database.videos
 
+    @property
+    def subscriptions(self) -> AsyncIOMotorDatabase:
+        """Get the 'subscriptions' collection from the MongoDB database."""
+
+        if self._database is None:
+            raise ValueError("Database connection is not established.")
+        return self._database.subscriptions
+
     @property
     def db(self) -> AsyncIOMotorDatabase:
         """Get the MongoDB database instance."""
@@ -35,6 +55,7 @@ class MongoDB(LoggerMixin):
         self.settings = get_settings()
         self.uri = self.settings.MONGODB_URI
         self.db_name = self.settings.MONGODB_DB_NAME
+        self._content_hashes = ContentHashCache(self.settings.video_hash_cache_size)
 
     async def connect(self) -> None:
         """Establish a connection to the MongoDB database."""
@@ -48,6 +69,21 @@ class MongoDB(LoggerMixin):
             )
 
             self._database = self._client[self.db_name]
+            self._video_writer = BulkWriter(
+                self._database.videos,
+                max_batch_size=self.settings.mongo_bulk_max_batch,
+                flush_interval=self.settings.mongo_bulk_flush_ms / 1000,
+            )
+            self._stats_writer = BulkWriter(
+                self._database.video_stats,
+                max_batch_size=self.settings.mongo_bulk_max_batch,
+                flush_interval=self.settings.mongo_bulk_flush_ms / 1000,
+            )
+            self._rollup_writer = BulkWriter(
+                self._database.video_stats_hourly,
+                max_batch_size=self.settings.mongo_bulk_max_batch,
+                flush_interval=self.settings.mongo_bulk_flush_ms / 1000,
+            )
 
             # Test the connection
             await self._client.admin.command("ping")
@@ -57,33 +93,421 @@ class MongoDB(LoggerMixin):
             print(f"Error connecting to MongoDB: {e}")
             raise e
 
+    async def ensure_indexes(self) -> None:
+        """Create missing time-series collections and every index in INDEXES."""
+
+        if self._database is None:
+            raise ValueError("Database connection is not established.")
+
+        existing_collections = set(await self._database.list_collection_names())
+        for collection_name, options in TIMESERIES_COLLECTIONS.items():
+            if collection_name not in existing_collections:
+                await self._database.create_collection(collection_name, **options)
+                self.logger.info("Created time-series collection %s", collection_name)
+
+        for collection_name, models in INDEXES.items():
+            created = await self._database[collection_name].create_indexes(models)
+            self.logger.info("Ensured indexes on %s: %s", collection_name, ", ".join(created))
+
+    async def check_index_drift(self) -> dict[str, dict[str, list[str]]]:
+        """Compare live indexes against INDEXES for every managed collection."""
+
+        if self._database is None:
+            raise ValueError("Database connection is not established.")
+
+        drift = {}
+        for collection_name, models in INDEXES.items():
+            existing = await self._database[collection_name].index_information()
+            drift[collection_name] = diff_indexes(models, existing)
+        return drift
+
     async def close(self) -> None:
         """Close the connection to the MongoDB database."""
 
+        await self.flush_writes()
         if self._client:
             self._client.close()
             self.logger.info("MongoDB connection closed")
 
     async def upsert_video_data(self, video_data: VideoRecord) -> None:
-        """Upsert video data into the MongoDB collection."""
+        """Upsert video data into the MongoDB collection.
+
+        Static metadata is only rewritten when its content hash changed, and
+        counters are written separately; see src/database/changes.py.
+        """
 
         if self._database is None:
             raise ValueError("Database connection is not established.")
 
+        static_operation, volatile_operation, digest = build_video_operations(
+            video_data, self._content_hashes.get(video_data.video_id)
+        )
+        operations = [volatile_operation]
+        if static_operation is not None:
+            operations.insert(0, static_operation)
+
         try:
-            videos_collection = self._database.videos
-            filter_query = {"video_id": video_data.video_id}
-            update_query = {"$set": video_data.model_dump()}
-
-            await videos_collection.update_one(
-                filter_query,
-                update_query,
-                upsert=True,
-            )
+            await self._database.videos.bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            # A duplicate key on the guarded static upsert means it was unchanged
+            unexpected = [
+                error
+                for error in e.details.get("writeErrors", [])
+                if not (
+                    static_operation is not None
+                    and error["index"] == 0
+                    and error.get("code") == DUPLICATE_KEY_ERROR
+                )
+            ]
+            if unexpected:
+                self._content_hashes.discard(video_data.video_id)
+                self.logger.error("Error upserting video data: %s", unexpected)
+                raise e
         except Exception as e:
-            self.logger.error(f"Error upserting video data: {e}")
+            self._content_hashes.discard(video_data.video_id)
+            self.logger.error("Error upserting video data: %s", e)
             raise e
 
+        self._content_hashes.set(video_data.video_id, digest)
+
+    async def queue_video_upsert(self, video_data: VideoRecord) -> WriteResult:
+        """Buffer a change-aware video upsert for the next bulk write and wait for it.
+
+        Only counters are written when the video's static metadata is known to
+        be unchanged; otherwise a hash-guarded upsert is queued alongside them.
+        """
+
+        if self._video_writer is None:
+            raise ValueError("Database connection is not established.")
+
+        static_operation, volatile_operation, digest = build_video_operations(
+            video_data, self._content_hashes.get(video_data.video_id)
+        )
+        submissions = [self._video_writer.submit(volatile_operation)]
+        if static_operation is not None:
+            submissions.append(self._video_writer.submit(static_operation, duplicate_key_ok=True))
+
+        results = await asyncio.gather(*submissions)
+        for result in results:
+            if not result.success:
+                self._content_hashes.discard(video_data.video_id)
+                return result
+
+        self._content_hashes.set(video_data.video_id, digest)
+        return WriteResult(success=True, unchanged=all(result.unchanged for result in results[1:]))
+
+    async def mark_video_deleted(self, video_id: str) -> None:
+        """Flag a stored video as deleted on YouTube, keeping its metadata."""
+
+        if self._database is None:
+            raise ValueError("Database connection is not established.")
+
+        await self._database.videos.update_one(
+            {"video_id": video_id},
+            {"$set": {"deleted_at": datetime.now(UTC)}},
+        )
+
+    async def flush_writes(self) -> None:
+        """Flush any buffered bulk writes."""
+
+        for writer in (self._video_writer, self._stats_writer, self._rollup_writer):
+            if writer is not None:
+                await writer.flush()
+
+    async def queue_stats_snapshot(
+        self, video_id: str, counters: dict[str, int], ts: datetime | None = None
+    ) -> WriteResult:
+        """Buffer a statistics snapshot and its hourly rollup update and wait for both."""
+
+        if self._stats_writer is None or self._rollup_writer is None:
+            raise ValueError("Database connection is not established.")
+
+        snapshot, rollup = build_stats_operations(video_id, counters, ts or datetime.now(UTC))
+        results = await asyncio.gather(
+            self._stats_writer.submit(snapshot), self._rollup_writer.submit(rollup)
+        )
+        for result in results:
+            if not result.success:
+                return result
+        return WriteResult(success=True)
+
+    async def queue_stats_refresh(
+        self, video_id: str, counters: dict[str, int], next_refresh: datetime, ts: datetime
+    ) -> WriteResult:
+        """Buffer refreshed counters for a stored video along with their snapshot."""
+
+        if self._video_writer is None:
+            raise ValueError("Database connection is not established.")
+
+        update = UpdateOne(
+            {"video_id": video_id},
+            {"$set": {**counters, "stats_refreshed_at": ts, "next_stats_refresh_at": next_refresh}},
+        )
+        results = await asyncio.gather(
+            self._video_writer.submit(update), self.queue_stats_snapshot(video_id, counters, ts)
+        )
+        for result in results:
+            if not result.success:
+                return result
+        return WriteResult(success=True)
+
+    async def claim_videos_due_for_refresh(
+        self, now: datetime, lease: timedelta, limit: int
+    ) -> list[dict]:
+        """Find videos whose statistics are due and lease them for one refresh.
+
+        Leasing pushes their next refresh `lease` into the future, so other
+        workers skip them while this one refreshes them. Each video is leased
+        by a single conditional update tagged with a claim token, so when two
+        workers race for the same videos, each gets back only those it won.
+        Videos that were never scheduled are due immediately.
+        """
+
+        if self._database is None:
+            raise ValueError("Database connection is not established.")
+
+        query = {
+            "$or": [
+                {"next_stats_refresh_at": {"$lte": now}},
+                {"next_stats_refresh_at": None},
+            ],
+            "deleted_at": {"$exists": False},
+        }
+        cursor = (
+            self._database.videos.find(query, {"_id": 0, "video_id": 1})
+            .sort("next_stats_refresh_at", 1)
+            .limit(limit)
+        )
+        candidates = [video["video_id"] for video in await cursor.to_list(length=limit)]
+        if not candidates:
+            return []
+
+        token = uuid.uuid4().hex
+        await self._database.videos.update_many(
+            {"video_id": {"$in": candidates}, **query},
+            {"$set": {"next_stats_refresh_at": now + lease, "stats_claim": token}},
+        )
+        cursor = self._database.videos.find(
+            {"video_id": {"$in": candidates}, "stats_claim": token},
+            {"_id": 0, "video_id": 1, "published_at": 1},
+        )
+        return await cursor.to_list(length=limit)
+
+    async def defer_stats_refresh(self, video_ids: list[str], until: datetime) -> None:
+        """Push the next statistics refresh of the given videos to `until`."""
+
+        if self._database is None:
+            raise ValueError("Database connection is not established.")
+
+        await self._database.videos.update_many(
+            {"video_id": {"$in": video_ids}}, {"$set": {"next_stats_refresh_at": until}}
+        )
+
+    async def get_stats_growth(
+        self,
+        video_id: str,
+        since: datetime,
+        until: datetime,
+        granularity: str = "hour",
+    ) -> list[dict]:
+        """Get the counters of a video at the end of each hour or day in a range.
+
+        Points come from the hourly rollups; daily points keep the last hour
+        of each day. Hours without any snapshot have no point.
+        """
+
+        if self._database is None:
+            raise ValueError("Database connection is not established.")
+
+        match = {"video_id": video_id, "hour": {"$gte": hour_bucket(since), "$lte": until}}
+        pipeline: list[dict] = [{"$match": match}, {"$sort": {"hour": 1}}]
+        if granularity == "day":
+            pipeline += [
+                {
+                    "$group": {
+                        "_id": {"$dateTrunc": {"date": "$hour", "unit": "day"}},
+                        "last_at": {"$max": "$last_at"},
+                        "samples": {"$sum": "$samples"},
+                        **{field: {"$max": f"${field}"} for field in STATS_FIELDS},
+                    }
+                },
+                {"$sort": {"_id": 1}},
+            ]
+        pipeline.append(
+            {
+                "$project": {
+                    "_id": 0,
+                    "bucket": "$_id" if granularity == "day" else "$hour",
+                    "last_at": 1,
+                    "samples": 1,
+                    **dict.fromkeys(STATS_FIELDS, 1),
+                }
+            }
+        )
+        return await self._database.video_stats_hourly.aggregate(pipeline).to_list(length=None)
+
+    async def get_stats_velocity(self, video_id: str, window: timedelta) -> dict | None:
+        """Compute how fast a video's counters grew over the trailing `window`.
+
+        The rate is taken between the earliest and the latest snapshot of the
+        hourly rollups in the window, and is None with fewer than two snapshots.
+        """
+
+        if self._database is None:
+            raise ValueError("Database connection is not established.")
+
+        since = hour_bucket(datetime.now(UTC) - window)
+        rollups = self._database.video_stats_hourly.find(
+            {"video_id": video_id, "hour": {"$gte": since}}
+        ).sort("hour", 1)
+        rollups = await rollups.to_list(length=None)
+        if not rollups:
+            return None
+
+        first, last = rollups[0], rollups[-1]
+        elapsed_hours = (last["last_at"] - first["first_at"]).total_seconds() / 3600
+        return {
+            "first_at": first["first_at"],
+            "last_at": last["last_at"],
+            **{
+                f"{field}_per_hour": (
+                    (last[field] - first[f"first_{field}"]) / elapsed_hours
+                    if elapsed_hours > 0
+                    else None
+                )
+                for field in STATS_FIELDS
+            },
+        }
+
+    async def record_subscription_request(
+        self, channel_id: str, topic: str, mode: str, lease_seconds: int | None = None
+    ) -> None:
+        """Record that a (un)subscribe request for a channel was accepted by the hub.
+
+        Until the hub verifies the intent, the lease is assumed to run for the
+        requested `lease_seconds` from now.
+        """
+
+        now = datetime.now(UTC)
+        update: dict = {
+            "topic": topic,
+            "status": "pending" if mode == "subscribe" else "unsubscribing",
+            "renewal_requested_at": now,
+        }
+        if mode == "subscribe" and lease_seconds:
+            update["lease_seconds"] = lease_seconds
+            update["lease_expires_at"] = now + timedelta(seconds=lease_seconds)
+
+        await self.subscriptions.update_one(
+            {"channel_id": channel_id},
+            {"$set": update, "$setOnInsert": {"channel_id": channel_id, "created_at": now}},
+            upsert=True,
+        )
+
+    async def record_subscription_verified(
+        self, channel_id: str, topic: str, mode: str, lease_seconds: int | None = None
+    ) -> bool:
+        """Record the hub's verification of a subscribe or unsubscribe intent.
+
+        Only a change we requested is recorded: the subscription must be
+        pending for a subscribe, or unsubscribing for an unsubscribe. Returns
+        whether it was.
+        """
+
+        now = datetime.now(UTC)
+        update: dict = {"topic": topic, "last_verified_at": now}
+        if mode == "subscribe":
+            expected_status = "pending"
+            update["status"] = "active"
+            if lease_seconds:
+                update["lease_seconds"] = lease_seconds
+                update["lease_expires_at"] = now + timedelta(seconds=lease_seconds)
+        else:
+            expected_status = "unsubscribing"
+            update["status"] = "unsubscribed"
+            update["lease_expires_at"] = None
+
+        result = await self.subscriptions.update_one(
+            {"channel_id": channel_id, "status": expected_status}, {"$set": update}
+        )
+        return result.matched_count > 0
+
+    async def find_subscriptions_due(
+        self, expires_before: datetime, requested_before: datetime, limit: int = 1000
+    ) -> list[dict]:
+        """Find subscriptions whose lease ends before `expires_before`.
+
+        Subscriptions with a renewal requested after `requested_before` are
+        skipped, since that renewal may still be awaiting verification.
+        """
+
+        query = {
+            "status": {"$in": ["active", "pending"]},
+            "lease_expires_at": {"$lt": expires_before},
+            "$or": [
+                {"renewal_requested_at": {"$exists": False}},
+                {"renewal_requested_at": {"$lt": requested_before}},
+            ],
+        }
+        cursor = self.subscriptions.find(query).sort("lease_expires_at", 1).limit(limit)
+        return await cursor.to_list(length=limit)
+
+    async def claim_subscription_renewal(self, channel_id: str, requested_before: datetime) -> bool:
+        """Atomically claim a subscription for renewal so only one scheduler renews it."""
+
+        result = await self.subscriptions.update_one(
+            {
+                "channel_id": channel_id,
+                "$or": [
+                    {"renewal_requested_at": {"$exists": False}},
+                    {"renewal_requested_at": {"$lt": requested_before}},
+                ],
+            },
+            {"$set": {"renewal_requested_at": datetime.now(UTC)}},
+        )
+        return result.modified_count == 1
+
+    async def get_backfill_checkpoint(self, channel_id: str) -> dict | None:
+        """Get the saved backfill progress of a channel."""
+
+        if self._database is None:
+            raise ValueError("Database connection is not established.")
+
+        return await self._database.backfill_checkpoints.find_one({"channel_id": channel_id})
+
+    async def save_backfill_checkpoint(self, channel_id: str, **fields) -> None:
+        """Save the backfill progress of a channel."""
+
+        if self._database is None:
+            raise ValueError("Database connection is not established.")
+
+        now = datetime.now(UTC)
+        await self._database.backfill_checkpoints.update_one(
+            {"channel_id": channel_id},
+            {
+                "$set": {**fields, "updated_at": now},
+                "$setOnInsert": {"channel_id": channel_id, "created_at": now},
+            },
+            upsert=True,
+        )
+
+    def find_videos(
+        self,
+        query: dict,
+        projection: dict | None = None,
+        limit: int = 0,
+    ) -> AsyncIOMotorCursor:
+        """Find videos newest first, in the (published_at, _id) keyset order."""
+
+        if self._database is None:
+            raise ValueError("Database connection is not established.")
+
+        return (
+            self._database.videos.find(query, projection)
+            .sort([("published_at", DESCENDING), ("_id", DESCENDING)])
+            .limit(limit)
+        )
+
     async def is_healthy(self) -> DatabaseResponse:
         """Check if the MongoDB connection is healthy."""
 
@@ -94,7 +518,7 @@ class MongoDB(LoggerMixin):
                 details=None,
             )
         except Exception as e:
-            self.logger.error(f"MongoDB health check failed: {e}")
+            self.logger.error("MongoDB health check failed: %s", e)
             return DatabaseResponse(
                 status="unhealthy",
                 details=str(e),
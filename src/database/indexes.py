@@ -0,0 +1,136 @@
+"""Collection and index definitions for MongoDB, and a drift check command.
+
+Run `python -m src.database.indexes` to compare the live indexes against the
+definitions below, or `python -m src.database.indexes --apply` to create any
+that are missing.
+"""
+
+import argparse
+import asyncio
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+from src.config.settings import get_settings
+
+settings = get_settings()
+
+# Time-series collections are created explicitly, before their indexes.
+TIMESERIES_COLLECTIONS: dict[str, dict] = {
+    "video_stats": {
+        "timeseries": {"timeField": "ts", "metaField": "video_id", "granularity": "minutes"},
+        "expireAfterSeconds": settings.stats_raw_retention_days * 86400,
+    },
+}
+
+INDEXES: dict[str, list[IndexModel]] = {
+    "videos": [
+        IndexModel([("video_id", ASCENDING)], name="video_id_unique", unique=True),
+        # `_id` is the keyset pagination tie-breaker, so it completes the sort.
+        IndexModel(
+            [("channel_id", ASCENDING), ("published_at", DESCENDING), ("_id", DESCENDING)],
+            name="channel_id_published_at_id",
+        ),
+        IndexModel([("published_at", DESCENDING), ("_id", DESCENDING)], name="published_at_id"),
+        # Live and upcoming broadcasts are a small slice of the collection that
+        # is queried on its own, so only index those documents.
+        IndexModel(
+            [("live_broadcast_content", ASCENDING), ("published_at", DESCENDING)],
+            name="live_broadcasts",
+            partialFilterExpression={"live_broadcast_content": {"$in": ["live", "upcoming"]}},
+        ),
+        IndexModel([("next_stats_refresh_at", ASCENDING)], name="next_stats_refresh_at"),
+    ],
+    "subscriptions": [
+        IndexModel([("channel_id", ASCENDING)], name="channel_id_unique", unique=True),
+        IndexModel([("status", ASCENDING), ("lease_expires_at", ASCENDING)], name="lease_due"),
+    ],
+    # MongoDB 6.3+ creates this index for new time-series collections itself
+    "video_stats": [
+        IndexModel([("video_id", ASCENDING), ("ts", ASCENDING)], name="video_id_1_ts_1"),
+    ],
+    "video_stats_hourly": [
+        IndexModel(
+            [("video_id", ASCENDING), ("hour", ASCENDING)], name="video_id_hour", unique=True
+        ),
+    ],
+    "backfill_checkpoints": [
+        IndexModel([("channel_id", ASCENDING)], name="channel_id_unique", unique=True),
+    ],
+    "notification_dedup": [
+        IndexModel(
+            [("created_at", ASCENDING)],
+            name="created_at_ttl",
+            expireAfterSeconds=settings.dedup_ttl_seconds,
+        ),
+    ],
+}
+
+# Index options that are compared when checking for drift.
+_COMPARED_OPTIONS = ("unique", "partialFilterExpression", "expireAfterSeconds", "sparse")
+
+
+def _normalize(spec: dict) -> dict:
+    """Reduce an index document to the keys and options that define its behavior."""
+
+    return {
+        "key": [(field, direction) for field, direction in dict(spec["key"]).items()],
+        **{option: spec[option] for option in _COMPARED_OPTIONS if option in spec},
+    }
+
+
+def diff_indexes(expected: list[IndexModel], existing: dict[str, dict]) -> dict[str, list[str]]:
+    """Compare expected index models with `index_information()` output.
+
+    Returns the names of indexes that are missing, that exist with different
+    keys or options (changed), and that exist but are not defined (unexpected).
+    """
+
+    missing: list[str] = []
+    changed: list[str] = []
+    expected_names = set()
+
+    for model in expected:
+        document = model.document
+        name = document["name"]
+        expected_names.add(name)
+        if name not in existing:
+            missing.append(name)
+        elif _normalize(document) != _normalize(existing[name]):
+            changed.append(name)
+
+    unexpected = [name for name in existing if name != "_id_" and name not in expected_names]
+    return {"missing": missing, "changed": changed, "unexpected": unexpected}
+
+
+async def _main(apply: bool) -> int:
+    """Report index drift for every managed collection."""
+
+    from src.database.db import MongoDB
+
+    mongodb = MongoDB()
+    await mongodb.connect()
+    try:
+        if apply:
+            await mongodb.ensure_indexes()
+        drift = await mongodb.check_index_drift()
+    finally:
+        await mongodb.close()
+
+    drifted = False
+    for collection, report in drift.items():
+        for kind, names in report.items():
+            for name in names:
+                drifted = True
+                print(f"{collection}: {kind} index {name}")
+    if not drifted:
+        print("Indexes match their definitions.")
+    return 1 if drifted else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check MongoDB indexes for drift.")
+    parser.add_argument(
+        "--apply", action="store_true", help="Create missing indexes before checking."
+    )
+    args = parser.parse_args()
+    raise SystemExit(asyncio.run(_main(args.apply)))
@@ -1,15 +1,23 @@
+from datetime import datetime
+
 from pydantic import BaseModel, Field
 
 
 class VideoRecord(BaseModel):
-    """Schema for storing video records in the database."""
+    """Schema for storing video records in the database.
+
+    VideoTransformer builds records from YouTube API responses with
+    `model_validate`, which runs in pydantic-core and is cheaper than
+    `model_construct`; `model_dump()` is the single serialization step
+    before the document is written.
+    """
 
     video_id: str = Field(..., description="Unique identifier for the video")
     title: str = Field(..., description="Title of the video")
     description: str = Field(...,
                              description="Description of the video content")
-    published_at: str = Field(...,
-                              description="Timestamp when the video was published")
+    published_at: datetime = Field(...,
+                                   description="Timestamp when the video was published")
     channel_id: str = Field(...,
                             description="Identifier of the channel that uploaded the video")
     channel_title: str = Field(...,
@@ -32,12 +40,12 @@ class VideoRecord(BaseModel):
                                         description="Live broadcast content status")
     privacy_status: str = Field(
         "public", description="Privacy status of the video")
-    notification_received_at: str = Field(...,
-                                          description="Timestamp when notification was received")
-    last_updated_at: str = Field(...,
-                                 description="Timestamp when the record was last updated")
-    created_at: str = Field(...,
-                            description="Timestamp when the record was created")
+    notification_received_at: datetime = Field(...,
+                                               description="Timestamp when notification was received")
+    last_updated_at: datetime = Field(...,
+                                      description="Timestamp when the record was last updated")
+    created_at: datetime = Field(...,
+                                 description="Timestamp when the record was created")
 
 
 class DatabaseResponse(BaseModel):
@@ -46,3 +54,13 @@ class DatabaseResponse(BaseModel):
     status: str = Field(..., description="Status of the database operation")
     details: str | None = Field(
         None, description="Additional details about the operation")
+
+
+class WriteResult(BaseModel):
+    """Schema for the outcome of a single buffered write."""
+
+    success: bool = Field(..., description="Whether the write was applied")
+    unchanged: bool = Field(
+        False, description="Whether the document was already up to date")
+    error: str | None = Field(
+        None, description="Error message if the write failed")
@@ -0,0 +1,70 @@
+"""Statistics history for videos.
+
+Every processed video appends a raw snapshot of its counters to the
+`video_stats` time-series collection, bucketed by `video_id`. Alongside it,
+an hourly rollup document per video is upserted into `video_stats_hourly`,
+keeping the first and last counters seen in that hour. Growth curves and
+velocity are served from the rollups, so their cost grows with the number of
+hours asked for rather than with the number of snapshots recorded.
+
+Counters change fastest right after publishing, so videos are also polled
+for fresh statistics on an age-tiered schedule; see `next_refresh_at`.
+"""
+
+from datetime import datetime, timedelta
+
+from pymongo import InsertOne, UpdateOne
+
+STATS_FIELDS = ("view_count", "like_count", "comment_count")
+
+# (maximum video age, refresh interval) pairs, youngest first. Videos older
+# than the last tier are refreshed every OLDEST_REFRESH_INTERVAL.
+REFRESH_TIERS = (
+    (timedelta(hours=6), timedelta(minutes=15)),
+    (timedelta(days=2), timedelta(hours=1)),
+    (timedelta(days=14), timedelta(hours=6)),
+    (timedelta(days=90), timedelta(days=1)),
+)
+OLDEST_REFRESH_INTERVAL = timedelta(days=7)
+
+
+def hour_bucket(timestamp: datetime) -> datetime:
+    """Truncate a timestamp to the start of its hour."""
+
+    return timestamp.replace(minute=0, second=0, microsecond=0)
+
+
+def next_refresh_at(published_at: datetime, now: datetime) -> datetime:
+    """Get when the statistics of a video published at `published_at` are next due."""
+
+    if published_at.tzinfo is None:
+        published_at = published_at.replace(tzinfo=now.tzinfo)
+    age = now - published_at
+    for max_age, interval in REFRESH_TIERS:
+        if age < max_age:
+            return now + interval
+    return now + OLDEST_REFRESH_INTERVAL
+
+
+def build_stats_operations(
+    video_id: str, counters: dict[str, int], ts: datetime
+) -> tuple[InsertOne, UpdateOne]:
+    """Build the raw snapshot insert and the hourly rollup upsert for a video's counters."""
+
+    snapshot = InsertOne({"video_id": video_id, "ts": ts, **counters})
+
+    # Counters only grow in practice, but deliveries can arrive out of order,
+    # so the rollup keeps the extremes of the hour rather than the latest value.
+    rollup = UpdateOne(
+        {"video_id": video_id, "hour": hour_bucket(ts)},
+        {
+            "$min": {
+                "first_at": ts,
+                **{f"first_{field}": counters[field] for field in STATS_FIELDS},
+            },
+            "$max": {"last_at": ts, **counters},
+            "$inc": {"samples": 1},
+        },
+        upsert=True,
+    )
+    return snapshot, rollup
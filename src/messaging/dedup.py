@@ -0,0 +1,158 @@
+"""Duplicate notification suppression.
+
+The hub redelivers the same notification many times. A notification is
+identified by its video ID plus its `updated` timestamp, so a genuine change
+to a video (a new `updated` value) still goes through while replays of the
+same change are dropped.
+"""
+
+import time
+from collections import OrderedDict
+from datetime import UTC, datetime
+
+from pymongo.errors import DuplicateKeyError
+
+from src.config.logging import LoggerMixin
+from src.database.db import MongoDB
+
+
+def notification_key(video_id: str, updated: str | None) -> str:
+    """Build the dedup key of a notification."""
+
+    return f"{video_id}@{updated or ''}"
+
+
+class DedupCache:
+    """In-process set of recently seen keys with LRU eviction and a TTL."""
+
+    def __init__(self, max_size: int = 100000, ttl_seconds: float = 86400) -> None:
+        """Initialize an empty cache."""
+
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, float] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def contains(self, key: str) -> bool:
+        """Check whether a key was seen within the TTL."""
+
+        expires_at = self._entries.get(key)
+        if expires_at is None:
+            return False
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return False
+        self._entries.move_to_end(key)
+        return True
+
+    def add(self, key: str) -> None:
+        """Record a key, evicting the least recently used keys when full."""
+
+        self._entries[key] = time.monotonic() + self.ttl_seconds
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def discard(self, key: str) -> None:
+        """Forget a key."""
+
+        self._entries.pop(key, None)
+
+
+class MongoDedupStore(LoggerMixin):
+    """Dedup keys shared between processes, stored in MongoDB.
+
+    Keys are namespaced by `scope` so the webhook and the worker keep separate
+    records. Documents expire through the TTL index on `created_at`.
+    """
+
+    COLLECTION = "notification_dedup"
+
+    def __init__(self, mongodb: MongoDB, scope: str) -> None:
+        """Initialize the store for one scope."""
+
+        self.mongodb = mongodb
+        self.scope = scope
+
+    def _id(self, key: str) -> str:
+        return f"{self.scope}:{key}"
+
+    async def claim(self, key: str) -> bool:
+        """Atomically record a key; returns False if it was already recorded."""
+
+        try:
+            await self.mongodb.db[self.COLLECTION].insert_one(
+                {"_id": self._id(key), "created_at": datetime.now(UTC)}
+            )
+        except DuplicateKeyError:
+            return False
+        return True
+
+    async def contains(self, key: str) -> bool:
+        """Check whether a key is recorded."""
+
+        document = await self.mongodb.db[self.COLLECTION].find_one(
+            {"_id": self._id(key)}, {"_id": 1}
+        )
+        return document is not None
+
+    async def add(self, key: str) -> None:
+        """Record a key if it is not recorded yet."""
+
+        await self.mongodb.db[self.COLLECTION].update_one(
+            {"_id": self._id(key)},
+            {"$setOnInsert": {"created_at": datetime.now(UTC)}},
+            upsert=True,
+        )
+
+    async def discard(self, key: str) -> None:
+        """Forget a key."""
+
+        await self.mongodb.db[self.COLLECTION].delete_one({"_id": self._id(key)})
+
+
+class Deduplicator(LoggerMixin):
+    """Checks keys against the in-process cache, then the optional shared store."""
+
+    def __init__(self, cache: DedupCache, store: MongoDedupStore | None = None) -> None:
+        """Initialize the deduplicator."""
+
+        self.cache = cache
+        self.store = store
+
+    async def claim(self, key: str) -> bool:
+        """Record a key and report whether this is the first time it was seen."""
+
+        if self.cache.contains(key):
+            return False
+        if self.store is not None and not await self.store.claim(key):
+            self.cache.add(key)
+            return False
+        self.cache.add(key)
+        return True
+
+    async def is_duplicate(self, key: str) -> bool:
+        """Check whether a key was already recorded, without recording it."""
+
+        if self.cache.contains(key):
+            return True
+        if self.store is not None and await self.store.contains(key):
+            self.cache.add(key)
+            return True
+        return False
+
+    async def remember(self, key: str) -> None:
+        """Record a key once its work has completed."""
+
+        self.cache.add(key)
+        if self.store is not None:
+            await self.store.add(key)
+
+    async def forget(self, key: str) -> None:
+        """Forget a claimed key whose work could not be completed."""
+
+        self.cache.discard(key)
+        if self.store is not None:
+            await self.store.discard(key)
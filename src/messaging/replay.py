@@ -0,0 +1,69 @@
+"""Replay dead-lettered messages onto the worker queue.
+
+Usage:
+
+    python -m src.messaging.replay [--limit N] [--dry-run]
+
+Messages are received from SQS_DLQ_URL, sent to SQS_QUEUE_URL with their
+original body, and deleted from the dead-letter queue once sent. With
+`--dry-run` they are only printed, and become visible again in the
+dead-letter queue after its visibility timeout.
+"""
+
+import argparse
+import asyncio
+
+from src.config.settings import get_settings
+from src.messaging.sqs import SQSClient
+
+
+async def replay(limit: int, dry_run: bool = False) -> int:
+    """Move up to `limit` messages from the dead-letter queue back, returning how many."""
+
+    settings = get_settings()
+    if not settings.SQS_DLQ_URL:
+        raise SystemExit("SQS_DLQ_URL is not set.")
+
+    dead_letter_queue = SQSClient(settings.SQS_DLQ_URL)
+    queue = SQSClient()
+    replayed = 0
+    try:
+        while replayed < limit:
+            messages = await dead_letter_queue.receive_messages(
+                max_messages=min(SQSClient.MAX_BATCH_SIZE, limit - replayed), wait_seconds=1
+            )
+            if not messages:
+                break
+
+            for message in messages:
+                attributes = {
+                    name: value.get("StringValue")
+                    for name, value in message.get("MessageAttributes", {}).items()
+                }
+                print(f"{message['MessageId']} {attributes.get('error', '')}: {message['Body']}")
+            if dry_run:
+                replayed += len(messages)
+                continue
+
+            failed = set(await queue.send_messages([message["Body"] for message in messages]))
+            sent = [message for message in messages if message["Body"] not in failed]
+            await dead_letter_queue.delete_messages([message["ReceiptHandle"] for message in sent])
+            replayed += len(sent)
+            if failed:
+                print(f"{len(failed)} messages could not be sent and stay dead-lettered.")
+                break
+    finally:
+        await queue.close()
+        await dead_letter_queue.close()
+    return replayed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--limit", type=int, default=100, help="Maximum messages to replay")
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Print the messages without replaying them"
+    )
+    args = parser.parse_args()
+    count = asyncio.run(replay(args.limit, args.dry_run))
+    print(f"{'Found' if args.dry_run else 'Replayed'} {count} messages.")
@@ -0,0 +1,84 @@
+"""Retry policy, visibility heartbeats and dead-lettering for queue messages.
+
+A message that fails is not left to reappear after the full visibility
+timeout. Its visibility is set to an exponential backoff delay instead. Once
+it has been received `max_receives` times it is moved to the dead-letter
+queue, from where `python -m src.messaging.replay` can send it back. While a
+message is being processed, a heartbeat keeps extending its visibility, so
+slow work is not handed to a second worker.
+"""
+
+import asyncio
+import contextlib
+
+from src.config.logging import LoggerMixin
+from src.messaging.sqs import SQSClient
+
+
+class PermanentMessageError(Exception):
+    """Raised for a message that can never succeed; it is dead-lettered right away."""
+
+
+def receive_count(message: dict) -> int:
+    """Get how many times SQS has handed out a message, including this time."""
+
+    return int(message.get("Attributes", {}).get("ApproximateReceiveCount", 1))
+
+
+class RetryPolicy:
+    """Exponential backoff for failed messages, up to a maximum number of receives."""
+
+    def __init__(self, max_receives: int = 5, base_delay: int = 30, max_delay: int = 3600) -> None:
+        """Initialize the policy."""
+
+        self.max_receives = max_receives
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def should_dead_letter(self, receives: int) -> bool:
+        """Check whether a message that failed on its `receives`-th receive is given up on."""
+
+        return receives >= self.max_receives
+
+    def backoff(self, receives: int) -> int:
+        """Get the delay in seconds before a message that failed is received again."""
+
+        return min(self.base_delay * 2 ** max(receives - 1, 0), self.max_delay)
+
+
+class VisibilityHeartbeat(LoggerMixin):
+    """Keeps a message invisible while it is processed.
+
+    Used as an async context manager around the processing of one message:
+    every `interval` seconds its visibility is extended to `timeout` seconds
+    from then. Work that finishes within `interval` never sends a request.
+    """
+
+    def __init__(self, sqs: SQSClient, receipt_handle: str, timeout: int, interval: float) -> None:
+        """Initialize the heartbeat for one received message."""
+
+        self.sqs = sqs
+        self.receipt_handle = receipt_handle
+        self.timeout = timeout
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+
+    async def __aenter__(self) -> "VisibilityHeartbeat":
+        self._task = asyncio.create_task(self._beat())
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+
+    async def _beat(self) -> None:
+        """Extend the message's visibility every interval until cancelled."""
+
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.sqs.change_visibility(self.receipt_handle, self.timeout)
+            except Exception as e:
+                self.logger.warning("Failed to extend message visibility: %s", e)
@@ -0,0 +1,252 @@
+"""Native asyncio AWS SQS transport."""
+
+import asyncio
+from collections.abc import Sequence
+from contextlib import AsyncExitStack
+
+import aioboto3
+from aiobotocore.config import AioConfig
+
+from src.config.logging import LoggerMixin
+from src.config.metrics import SQS_MESSAGES, SQS_REQUEST_SECONDS
+from src.config.settings import get_settings
+
+
+class SQSClient(LoggerMixin):
+    """Async SQS client backed by a single pooled aioboto3 session."""
+
+    MAX_BATCH_SIZE = 10  # SQS limit for ReceiveMessage and *MessageBatch calls
+    MAX_VISIBILITY_TIMEOUT = 43200  # SQS limit, 12 hours
+
+    def __init__(self, queue_url: str | None = None) -> None:
+        """Initialize the SQS session without opening any connections."""
+
+        self.settings = get_settings()
+        self.queue_url = queue_url or self.settings.SQS_QUEUE_URL
+        self._session = aioboto3.Session(
+            aws_access_key_id=self.settings.AWS_ACCESS_KEY_ID,
+            aws_secret_access_key=self.settings.AWS_SECRET_ACCESS_KEY,
+            region_name=self.settings.AWS_REGION,
+        )
+        self._config = AioConfig(max_pool_connections=self.settings.sqs_max_pool_connections)
+        self._exit_stack = AsyncExitStack()
+        self._client = None
+        self._connect_lock = asyncio.Lock()
+
+    async def connect(self):
+        """Open the pooled SQS client, reusing it if it is already open."""
+
+        async with self._connect_lock:
+            if self._client is None:
+                self._client = await self._exit_stack.enter_async_context(
+                    self._session.client("sqs", config=self._config)
+                )
+                self.logger.info("SQS client connected")
+        return self._client
+
+    @staticmethod
+    def _count(operation: str, total: int, failed: int) -> None:
+        """Count the messages of a batch call by outcome."""
+
+        SQS_MESSAGES.inc(total - failed, operation=operation, outcome="ok")
+        if failed:
+            SQS_MESSAGES.inc(failed, operation=operation, outcome="failed")
+
+    async def close(self) -> None:
+        """Close the pooled SQS client."""
+
+        if self._client is not None:
+            await self._exit_stack.aclose()
+            self._client = None
+            self.logger.info("SQS client closed")
+
+    async def receive_messages(
+        self,
+        max_messages: int = MAX_BATCH_SIZE,
+        wait_seconds: int = 20,
+        visibility_timeout: int | None = None,
+    ) -> list[dict]:
+        """Long-poll the queue for up to `max_messages` messages.
+
+        Messages carry their ApproximateReceiveCount attribute.
+        """
+
+        client = await self.connect()
+        params = {}
+        if visibility_timeout is not None:
+            params["VisibilityTimeout"] = visibility_timeout
+        with SQS_REQUEST_SECONDS.time(operation="receive"):
+            response = await client.receive_message(
+                QueueUrl=self.queue_url,
+                MaxNumberOfMessages=min(max_messages, self.MAX_BATCH_SIZE),
+                WaitTimeSeconds=wait_seconds,
+                AttributeNames=["ApproximateReceiveCount"],
+                MessageAttributeNames=["All"],
+                **params,
+            )
+        messages = response.get("Messages", [])
+        SQS_MESSAGES.inc(len(messages), operation="receive", outcome="ok")
+        return messages
+
+    async def send_message(self, body: str, attributes: dict[str, str] | None = None) -> dict:
+        """Send a single message to the queue, with optional string message attributes."""
+
+        client = await self.connect()
+        params = {}
+        if attributes:
+            params["MessageAttributes"] = {
+                name: {"DataType": "String", "StringValue": value}
+                for name, value in attributes.items()
+            }
+        return await client.send_message(QueueUrl=self.queue_url, MessageBody=body, **params)
+
+    async def change_visibility(self, receipt_handle: str, timeout: int) -> None:
+        """Make a received message visible again after `timeout` seconds."""
+
+        client = await self.connect()
+        await client.change_message_visibility(
+            QueueUrl=self.queue_url,
+            ReceiptHandle=receipt_handle,
+            VisibilityTimeout=min(max(timeout, 0), self.MAX_VISIBILITY_TIMEOUT),
+        )
+
+    async def change_visibilities(self, receipt_handles: Sequence[str], timeout: int) -> list[str]:
+        """Set the visibility of many messages with ChangeMessageVisibilityBatch.
+
+        Returns the handles that failed.
+        """
+
+        client = await self.connect()
+        failed: list[str] = []
+        for start in range(0, len(receipt_handles), self.MAX_BATCH_SIZE):
+            chunk = receipt_handles[start : start + self.MAX_BATCH_SIZE]
+            with SQS_REQUEST_SECONDS.time(operation="change_visibility"):
+                response = await client.change_message_visibility_batch(
+                    QueueUrl=self.queue_url,
+                    Entries=[
+                        {"Id": str(index), "ReceiptHandle": handle, "VisibilityTimeout": timeout}
+                        for index, handle in enumerate(chunk)
+                    ],
+                )
+            failures = response.get("Failed", [])
+            self._count("change_visibility", len(chunk), len(failures))
+            for failure in failures:
+                failed.append(chunk[int(failure["Id"])])
+                self.logger.error(
+                    "Failed to change SQS message visibility: %s", failure.get("Message")
+                )
+        return failed
+
+    async def delete_message(self, receipt_handle: str) -> None:
+        """Delete a single message."""
+
+        client = await self.connect()
+        await client.delete_message(QueueUrl=self.queue_url, ReceiptHandle=receipt_handle)
+
+    async def send_messages(self, bodies: Sequence[str]) -> list[str]:
+        """Send messages with SendMessageBatch, returning bodies that failed."""
+
+        client = await self.connect()
+        failed: list[str] = []
+        for start in range(0, len(bodies), self.MAX_BATCH_SIZE):
+            chunk = bodies[start : start + self.MAX_BATCH_SIZE]
+            with SQS_REQUEST_SECONDS.time(operation="send"):
+                response = await client.send_message_batch(
+                    QueueUrl=self.queue_url,
+                    Entries=[
+                        {"Id": str(index), "MessageBody": body} for index, body in enumerate(chunk)
+                    ],
+                )
+            failures = response.get("Failed", [])
+            for failure in failures:
+                failed.append(chunk[int(failure["Id"])])
+                self.logger.error("Failed to send SQS message: %s", failure.get("Message"))
+            self._count("send", len(chunk), len(failures))
+        return failed
+
+    async def delete_messages(self, receipt_handles: Sequence[str]) -> list[str]:
+        """Delete messages with DeleteMessageBatch, returning handles that failed."""
+
+        client = await self.connect()
+        failed: list[str] = []
+        for start in range(0, len(receipt_handles), self.MAX_BATCH_SIZE):
+            chunk = receipt_handles[start : start + self.MAX_BATCH_SIZE]
+            with SQS_REQUEST_SECONDS.time(operation="delete"):
+                response = await client.delete_message_batch(
+                    QueueUrl=self.queue_url,
+                    Entries=[
+                        {"Id": str(index), "ReceiptHandle": handle}
+                        for index, handle in enumerate(chunk)
+                    ],
+                )
+            failures = response.get("Failed", [])
+            for failure in failures:
+                failed.append(chunk[int(failure["Id"])])
+                self.logger.error("Failed to delete SQS message: %s", failure.get("Message"))
+            self._count("delete", len(chunk), len(failures))
+        return failed
+
+
+class SQSDeleteBuffer(LoggerMixin):
+    """Collects receipt handles and deletes them in DeleteMessageBatch calls.
+
+    A batch is flushed as soon as it holds MAX_BATCH_SIZE handles, or after
+    `flush_interval` seconds otherwise, so deletes never wait long for company.
+    """
+
+    def __init__(self, sqs: SQSClient, flush_interval: float = 0.05) -> None:
+        """Initialize the buffer in front of an SQS client."""
+
+        self.sqs = sqs
+        self.flush_interval = flush_interval
+        self._pending: list[tuple[str, asyncio.Future]] = []
+        self._flush_timer: asyncio.TimerHandle | None = None
+        self._flush_tasks: set[asyncio.Task] = set()
+
+    def delete(self, receipt_handle: str) -> asyncio.Future:
+        """Queue a message for deletion; the future resolves to True once deleted."""
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((receipt_handle, future))
+
+        if len(self._pending) >= SQSClient.MAX_BATCH_SIZE:
+            self._flush()
+        elif self._flush_timer is None:
+            self._flush_timer = loop.call_later(self.flush_interval, self._flush)
+        return future
+
+    def _flush(self) -> None:
+        """Hand the pending handles to a delete task."""
+
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, []
+        task = asyncio.create_task(self._delete_batch(batch))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _delete_batch(self, batch: list[tuple[str, asyncio.Future]]) -> None:
+        """Delete one batch and resolve the futures of its handles."""
+
+        try:
+            failed = set(await self.sqs.delete_messages([handle for handle, _ in batch]))
+        except Exception as e:
+            self.logger.error("Error deleting %s messages from SQS: %s", len(batch), e)
+            failed = {handle for handle, _ in batch}
+
+        for handle, future in batch:
+            if not future.done():
+                future.set_result(handle not in failed)
+
+    async def flush(self) -> None:
+        """Delete everything still buffered and wait for in-flight batches."""
+
+        self._flush()
+        if self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks, return_exceptions=True)
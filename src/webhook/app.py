@@ -1,21 +1,98 @@
 """A separate API for handling webhooks."""
 
-import feedparser
 import uvicorn
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.responses import PlainTextResponse
 
 from src.config.logging import get_logger, setup_logging
+from src.config.metrics import (
+    CONTENT_TYPE,
+    WEBHOOK_NOTIFICATIONS,
+    WEBHOOK_PARSE_SECONDS,
+    http_metrics_middleware,
+    render,
+)
 from src.config.settings import get_settings
+from src.database.db import MongoDB
+from src.messaging.dedup import DedupCache, Deduplicator, MongoDedupStore, notification_key
+from src.messaging.sqs import SQSClient
+from src.webhook.manager import WebSubManager
+from src.webhook.parser import parse_notification
+from src.webhook.publisher import NotificationPublisher
 
 setup_logging()
 logger = get_logger("webhook")
 settings = get_settings()
 
+# Bounds applied to the lease the hub grants (YouTube's hub grants at most 10 days)
+MIN_LEASE_SECONDS = 300
+MAX_LEASE_SECONDS = 864000
+
+sqs = SQSClient()
+mongodb = MongoDB()
+deduplicator = Deduplicator(
+    DedupCache(settings.dedup_cache_size, settings.dedup_ttl_seconds),
+    MongoDedupStore(mongodb, scope="webhook") if settings.dedup_shared_store else None,
+)
+publisher = NotificationPublisher(
+    sqs,
+    flush_interval=settings.webhook_publish_flush_ms / 1000,
+    max_buffered=settings.webhook_publish_max_buffered,
+    retry_max_delay=settings.webhook_publish_retry_max_seconds,
+    retry_timeout=settings.webhook_publish_retry_timeout_seconds,
+    # A dropped notification must not block the hub's redelivery of it
+    on_drop=deduplicator.forget,
+)
+
+
+async def lifespan(app: FastAPI):
+    """Lifespan event handler for the webhook application."""
+
+    # Startup event
+    logger.info("Starting up webhook application")
+    await sqs.connect()
+    await mongodb.connect()
+    yield
+    # Shutdown event
+    logger.info("Shutting down webhook application")
+    await publisher.flush()
+    await sqs.close()
+    await mongodb.close()
+
 
 app = FastAPI(
-    title="Webhook API", description="API for handling incoming webhooks.", version="0.0.1"
+    title="Webhook API",
+    description="API for handling incoming webhooks.",
+    version="0.0.1",
+    lifespan=lifespan,
 )
+app.middleware("http")(http_metrics_middleware("webhook"))
+
+
+async def _record_verification(topic: str | None, mode: str, lease_seconds: int | None) -> bool:
+    """Record a verified subscription change, if it is one we requested.
+
+    Returns False for intents we did not request, which must not be confirmed
+    to the hub. A registry failure answers 503 so the hub retries later.
+    """
+
+    channel_id = WebSubManager.channel_id_from_topic(topic) if topic else None
+    if not channel_id:
+        return False
+    try:
+        return await mongodb.record_subscription_verified(channel_id, topic, mode, lease_seconds)
+    except Exception as e:
+        logger.error("Failed to record %s verification for channel %s: %s", mode, channel_id, e)
+        raise HTTPException(
+            status_code=503, detail="Subscription registry unavailable.") from e
+
+
+def _lease_seconds(value: str | None) -> int | None:
+    """Parse the hub's lease, clamped to a sane range."""
+
+    if not value or not value.isdigit():
+        return None
+    return min(max(int(value), MIN_LEASE_SECONDS), MAX_LEASE_SECONDS)
 
 
 # /webhook?hub.mode=subscribe&hub.challenge=test123 HTTP/1.1
@@ -40,9 +117,16 @@ async def verify_subscription(request: Request) -> str:
                 "Missing challenge parameter in verification request.")
             raise HTTPException(
                 status_code=400, detail="Missing challenge parameter.")
+        lease_seconds = _lease_seconds(params.get("hub.lease_seconds"))
+        if not await _record_verification(topic, mode, lease_seconds):
+            logger.warning("Rejected verification of a subscription we did not request.")
+            raise HTTPException(status_code=404, detail="Unknown subscription.")
         logger.info("Webhook subscription verified.")
         return challenge
     elif mode == "unsubscribe":
+        if not await _record_verification(topic, mode, None):
+            logger.warning("Rejected verification of an unsubscription we did not request.")
+            raise HTTPException(status_code=404, detail="Unknown subscription.")
         logger.info("Webhook unsubscription verified.")
         return PlainTextResponse("Unsubscribed successfully.")
 
@@ -51,40 +135,72 @@ async def verify_subscription(request: Request) -> str:
         raise HTTPException(status_code=403, detail="Verification failed.")
 
 
-@app.post("/webhook", tags=["Webhook"], response_class=PlainTextResponse)
-async def receive_notification(request: Request) -> str:
-    """Endpoint to receive webhook notifications."""
+@app.post("/webhook", tags=["Webhook"], status_code=204)
+async def receive_notification(request: Request) -> Response:
+    """Endpoint to receive webhook notifications.
+
+    Notifications are handed to the publisher and acknowledged with 204
+    without waiting for SQS. If the publish buffer is full the hub gets a
+    503, so it redelivers the notification later.
+    """
 
     try:
         body = await request.body()
-        logger.info("Received webhook notification.", body=body.decode())
+        logger.info("Received webhook notification (%s bytes).", len(body))
 
-        feed = feedparser.parse(body)
+        with WEBHOOK_PARSE_SECONDS.time():
+            notifications = parse_notification(body)
 
-        for entry in feed.entries:
-            video_id = entry.yt_videoid
-            channel_id = entry.yt_channelid
-            published = entry.published
+        for notification in notifications:
+            video_id = notification.video_id
+            updated = notification.updated
 
             if not video_id:
                 logger.error(
                     "Missing video ID in webhook notification.")
+                WEBHOOK_NOTIFICATIONS.inc(outcome="missing_video_id")
+                continue
+
+            key = notification_key(video_id, updated)
+            if not await deduplicator.claim(key):
+                logger.debug("Dropping duplicate notification for video %s.", video_id)
+                WEBHOOK_NOTIFICATIONS.inc(outcome="duplicate")
                 continue
 
             logger.info("New video notification received.")
 
             message = {
                 "video_id": video_id,
-                "channel_id": channel_id,
-                "published": published,
+                "channel_id": notification.channel_id,
+                "published": notification.published,
+                "updated": updated,
             }
-
+            if notification.deleted:
+                message["deleted"] = True
+            if not publisher.publish(message, key):
+                # Let the hub's redelivery through once the queue drains
+                await deduplicator.forget(key)
+                WEBHOOK_NOTIFICATIONS.inc(outcome="rejected")
+                raise HTTPException(status_code=503, detail="Notification queue is full.")
+            WEBHOOK_NOTIFICATIONS.inc(outcome="published")
+
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.exception(
-            "Error processing webhook notification.", error=str(e))
+        WEBHOOK_NOTIFICATIONS.inc(outcome="error")
+        logger.exception("Error processing webhook notification.")
         raise HTTPException(
             status_code=500, detail="Internal server error.") from e
 
+    return Response(status_code=204)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """Expose the application's metrics in the Prometheus text format."""
+
+    return Response(render(), media_type=CONTENT_TYPE)
+
 
 @app.get("/health", tags=["Health"])
 async def health_check() -> dict:
@@ -1,8 +1,32 @@
+import asyncio
+import importlib.util
+from collections.abc import Iterable
+from datetime import UTC, datetime, timedelta
+from urllib.parse import parse_qs, urlparse
 
 import httpx
 
 from src.config.logging import LoggerMixin
 from src.config.settings import get_settings
+from src.database.db import MongoDB
+
+
+def create_hub_client() -> httpx.AsyncClient:
+    """Create a connection-pooled HTTP client for talking to the WebSub hub.
+
+    HTTP/2 is used when the optional `h2` package is installed, which lets
+    concurrent hub requests share a single connection.
+    """
+
+    settings = get_settings()
+    return httpx.AsyncClient(
+        http2=importlib.util.find_spec("h2") is not None,
+        limits=httpx.Limits(
+            max_connections=settings.websub_max_connections,
+            max_keepalive_connections=settings.websub_max_connections,
+        ),
+        timeout=10.0,
+    )
 
 
 class WebSubManager(LoggerMixin):
@@ -12,8 +36,48 @@ class WebSubManager(LoggerMixin):
     YOUTUBE_TOPIC = "https://www.youtube.com/xml/feeds/videos.xml?channel_id={channel_id}"
     LEASE_SECONDS = 432000  # 5 days
 
-    def __init__(self):
+    def __init__(
+        self, client: httpx.AsyncClient | None = None, mongodb: MongoDB | None = None
+    ):
+        """Initialize the manager.
+
+        `client` is an app-scoped HTTP client to share, and `mongodb` the
+        database in which accepted requests are recorded in the subscription
+        registry.
+        """
+
         self.settings = get_settings()
+        self._client = client
+        self._mongodb = mongodb
+
+    @staticmethod
+    def channel_id_from_topic(topic: str) -> str | None:
+        """Extract the channel ID from a YouTube feed topic URL."""
+
+        return parse_qs(urlparse(topic).query).get("channel_id", [None])[0]
+
+    async def _record_request(self, channel_id: str, topic_url: str, mode: str) -> None:
+        """Record a hub request in the registry before sending it, if one is configured."""
+
+        if self._mongodb is None:
+            return
+        try:
+            await self._mongodb.record_subscription_request(
+                channel_id,
+                topic_url,
+                mode,
+                self.LEASE_SECONDS if mode == "subscribe" else None,
+            )
+        except Exception as e:
+            self.logger.error("Failed to record %s request for channel %s: %s", mode, channel_id, e)
+
+    async def _post_to_hub(self, data: dict) -> httpx.Response:
+        """POST a form to the hub over the shared client, or a one-off client."""
+
+        if self._client is not None:
+            return await self._client.post(self.YOUTUBE_HUB_URL, data=data, timeout=10.0)
+        async with httpx.AsyncClient() as client:
+            return await client.post(self.YOUTUBE_HUB_URL, data=data, timeout=10.0)
 
     def get_callback_url(self) -> str:
         """Construct the callback URL for webhook notifications."""
@@ -36,10 +100,11 @@ class WebSubManager(LoggerMixin):
         }
 
         self.logger.info("Subscribing to channel.")
+        # Record the intent first: the hub may verify it before answering us
+        await self._record_request(channel_id, topic_url, "subscribe")
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(self.YOUTUBE_HUB_URL, data=data, timeout=10.0)
+            response = await self._post_to_hub(data)
             response.raise_for_status()
             if response.status_code in (202, 204):
                 self.logger.info(
@@ -49,7 +114,9 @@ class WebSubManager(LoggerMixin):
                     "channel_id": channel_id,
                     "response_code": response.status_code,
                     "response_text": response.text,
-                    # "expires_at": (datetime.now() + self.LEASE_SECONDS).isoformat()
+                    "expires_at": (
+                        datetime.now(UTC) + timedelta(seconds=self.LEASE_SECONDS)
+                    ).isoformat(),
                 }
             else:
                 self.logger.warning(
@@ -74,10 +141,10 @@ class WebSubManager(LoggerMixin):
         }
 
         self.logger.info("Unsubscribing from channel.")
+        await self._record_request(channel_id, topic_url, "unsubscribe")
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(self.YOUTUBE_HUB_URL, data=data, timeout=10.0)
+            response = await self._post_to_hub(data)
             response.raise_for_status()
             if response.status_code in (202, 204):
                 self.logger.info(
@@ -91,3 +158,27 @@ class WebSubManager(LoggerMixin):
             self.logger.error(
                 "HTTP error during unsubscription.")
             return {"status": "error", "channel_id": channel_id, "error": str(e)}
+
+    async def bulk_update(
+        self, channel_ids: Iterable[str], mode: str, concurrency: int | None = None
+    ) -> list[dict]:
+        """Subscribe or unsubscribe many channels concurrently.
+
+        At most `concurrency` hub requests are in flight at once. Every channel
+        gets its own result, in the order the channel IDs were given.
+        """
+
+        if mode not in ("subscribe", "unsubscribe"):
+            raise ValueError(f"Unsupported mode: {mode}")
+
+        operation = self.subscribe if mode == "subscribe" else self.unsubscribe
+        limit = asyncio.Semaphore(concurrency or self.settings.websub_bulk_concurrency)
+
+        async def run(channel_id: str) -> dict:
+            async with limit:
+                try:
+                    return await operation(channel_id)
+                except Exception as e:
+                    return {"status": "error", "channel_id": channel_id, "error": str(e)}
+
+        return await asyncio.gather(*(run(channel_id) for channel_id in channel_ids))
@@ -0,0 +1,119 @@
+"""Parser for YouTube WebSub push notifications.
+
+The hub only ever posts small Atom documents in a fixed schema, so a
+dedicated streaming parser is far cheaper than feedparser's general purpose
+feed handling. Anything the fast path cannot parse falls back to feedparser.
+"""
+
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+
+import feedparser
+
+from src.config.logging import get_logger
+
+logger = get_logger("webhook_parser")
+
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_YT = "{http://www.youtube.com/xml/schemas/2015}"
+_TOMBSTONE = "{http://purl.org/atompub/tombstones/1.0}"
+
+_ENTRY = f"{_ATOM}entry"
+_DELETED_ENTRY = f"{_TOMBSTONE}deleted-entry"
+_VIDEO_ID = f"{_YT}videoId"
+_CHANNEL_ID = f"{_YT}channelId"
+_PUBLISHED = f"{_ATOM}published"
+_UPDATED = f"{_ATOM}updated"
+_URI = f"{_ATOM}uri"
+
+_VIDEO_REF_PREFIX = "yt:video:"
+_CHANNEL_URI_MARKER = "/channel/"
+
+
+@dataclass(slots=True)
+class Notification:
+    """A single video notification from the hub."""
+
+    video_id: str | None
+    channel_id: str | None = None
+    published: str | None = None
+    updated: str | None = None
+    deleted: bool = False
+
+
+def _channel_from_uri(uri: str | None) -> str | None:
+    """Extract the channel ID from a youtube.com/channel/<id> URI."""
+
+    if not uri or _CHANNEL_URI_MARKER not in uri:
+        return None
+    return uri.rsplit(_CHANNEL_URI_MARKER, 1)[1] or None
+
+
+def _parse_atom(body: bytes) -> list[Notification]:
+    """Parse a notification with a namespace-aware streaming XML parser."""
+
+    parser = ET.XMLPullParser(events=("start", "end"))
+    parser.feed(body)
+    parser.close()
+
+    notifications: list[Notification] = []
+    current: Notification | None = None
+
+    for event, element in parser.read_events():
+        tag = element.tag
+        if event == "start":
+            if tag == _ENTRY:
+                current = Notification(video_id=None)
+            elif tag == _DELETED_ENTRY:
+                ref = element.get("ref", "")
+                current = Notification(
+                    video_id=ref.removeprefix(_VIDEO_REF_PREFIX) or None,
+                    updated=element.get("when"),
+                    deleted=True,
+                )
+            continue
+
+        if current is None:
+            continue
+
+        if tag == _VIDEO_ID:
+            current.video_id = element.text
+        elif tag == _CHANNEL_ID:
+            current.channel_id = element.text
+        elif tag == _PUBLISHED:
+            current.published = element.text
+        elif tag == _UPDATED:
+            current.updated = element.text
+        elif tag == _URI and current.deleted:
+            current.channel_id = _channel_from_uri(element.text)
+        elif tag in (_ENTRY, _DELETED_ENTRY):
+            notifications.append(current)
+            current = None
+            element.clear()
+
+    return notifications
+
+
+def _parse_feedparser(body: bytes) -> list[Notification]:
+    """Parse a notification with feedparser, for payloads the fast path rejects."""
+
+    feed = feedparser.parse(body)
+    return [
+        Notification(
+            video_id=entry.get("yt_videoid"),
+            channel_id=entry.get("yt_channelid"),
+            published=entry.get("published"),
+            updated=entry.get("updated"),
+        )
+        for entry in feed.entries
+    ]
+
+
+def parse_notification(body: bytes) -> list[Notification]:
+    """Parse a hub notification body into its video notifications."""
+
+    try:
+        return _parse_atom(body)
+    except ET.ParseError as e:
+        logger.warning("Falling back to feedparser for malformed notification: %s", e)
+        return _parse_feedparser(body)
@@ -0,0 +1,159 @@
+import asyncio
+import json
+import time
+from collections.abc import Awaitable, Callable
+
+from src.config.logging import LoggerMixin
+from src.config.metrics import WEBHOOK_PUBLISH_BUFFERED
+from src.messaging.sqs import SQSClient
+
+# A buffered message: (body, failed attempts, dedup key, time it was published)
+_Entry = tuple[str, int, str | None, float]
+
+
+class NotificationPublisher(LoggerMixin):
+    """Buffers notification messages and publishes them with SendMessageBatch.
+
+    `publish` never waits on SQS, so the webhook can acknowledge the hub right
+    away. Buffered messages are sent once MAX_BATCH_SIZE have accumulated, or
+    after `flush_interval` seconds. The hub is not told when a send fails, so
+    failed messages stay buffered and are retried with exponential backoff
+    for up to `retry_timeout` seconds, or until `flush` at shutdown; when one
+    is dropped, `on_drop` is called with its key so the caller can let a
+    redelivery through. When the buffer is full `publish` refuses new
+    messages so the caller can ask the hub to redeliver later.
+    """
+
+    def __init__(
+        self,
+        sqs: SQSClient,
+        flush_interval: float = 0.05,
+        max_buffered: int = 10000,
+        retry_base_delay: float = 0.5,
+        retry_max_delay: float = 30,
+        retry_timeout: float = 900,
+        on_drop: Callable[[str], Awaitable[None]] | None = None,
+    ) -> None:
+        """Initialize the publisher in front of an SQS client."""
+
+        self.sqs = sqs
+        self.flush_interval = flush_interval
+        self.max_buffered = max_buffered
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.retry_timeout = retry_timeout
+        self.on_drop = on_drop
+        self._pending: list[_Entry] = []
+        self._retrying: dict[asyncio.TimerHandle, list[_Entry]] = {}
+        self._flush_timer: asyncio.TimerHandle | None = None
+        self._flush_tasks: set[asyncio.Task] = set()
+        self._sending = 0
+        self._closing = False
+
+    @property
+    def buffered(self) -> int:
+        """Number of messages not sent yet, including those being sent or awaiting a retry."""
+
+        retrying = sum(len(entries) for entries in self._retrying.values())
+        return len(self._pending) + self._sending + retrying
+
+    def publish(self, message: dict, key: str | None = None) -> bool:
+        """Buffer a message for publishing; returns False if the buffer is full.
+
+        `key` identifies the message to `on_drop` if it cannot be sent.
+        """
+
+        if self.buffered >= self.max_buffered:
+            self.logger.warning("Notification buffer is full, rejecting message.")
+            return False
+
+        self._pending.append((json.dumps(message), 0, key, time.monotonic()))
+        WEBHOOK_PUBLISH_BUFFERED.set(self.buffered)
+        self._schedule_flush()
+        return True
+
+    def _schedule_flush(self) -> None:
+        """Flush now if a full batch is waiting, otherwise arm the flush timer."""
+
+        if len(self._pending) >= SQSClient.MAX_BATCH_SIZE:
+            self._flush()
+        elif self._pending and self._flush_timer is None:
+            loop = asyncio.get_running_loop()
+            self._flush_timer = loop.call_later(self.flush_interval, self._flush)
+
+    def _flush(self) -> None:
+        """Hand every full batch, plus any remainder, to send tasks."""
+
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+
+        while self._pending:
+            batch = self._pending[: SQSClient.MAX_BATCH_SIZE]
+            del self._pending[: SQSClient.MAX_BATCH_SIZE]
+            self._sending += len(batch)
+            task = asyncio.create_task(self._send_batch(batch))
+            self._flush_tasks.add(task)
+            task.add_done_callback(self._flush_tasks.discard)
+        WEBHOOK_PUBLISH_BUFFERED.set(self.buffered)
+
+    async def _send_batch(self, batch: list[_Entry]) -> None:
+        """Send one batch and schedule a retry of the messages that failed."""
+
+        bodies = [body for body, _, _, _ in batch]
+        try:
+            failed = set(await self.sqs.send_messages(bodies))
+        except Exception as e:
+            self.logger.error("Error publishing %s notifications to SQS: %s", len(batch), e)
+            failed = set(bodies)
+        finally:
+            self._sending -= len(batch)
+
+        now = time.monotonic()
+        retry = []
+        for body, attempts, key, published_at in batch:
+            if body not in failed:
+                continue
+            if self._closing or now - published_at >= self.retry_timeout:
+                self.logger.error("Dropping notification after %s attempts: %s", attempts + 1, body)
+                await self._dropped(key)
+                continue
+            retry.append((body, attempts + 1, key, published_at))
+
+        if retry:
+            attempts = max(entry[1] for entry in retry)
+            delay = min(self.retry_base_delay * 2 ** (attempts - 1), self.retry_max_delay)
+            handle = asyncio.get_running_loop().call_later(delay, lambda: self._requeue(handle))
+            self._retrying[handle] = retry
+        WEBHOOK_PUBLISH_BUFFERED.set(self.buffered)
+
+    def _requeue(self, handle: asyncio.TimerHandle) -> None:
+        """Move messages whose backoff has passed back into the send buffer."""
+
+        self._pending.extend(self._retrying.pop(handle, []))
+        self._schedule_flush()
+
+    async def _dropped(self, key: str | None) -> None:
+        """Report a dropped message to `on_drop`, without failing the batch."""
+
+        if key is None or self.on_drop is None:
+            return
+        try:
+            await self.on_drop(key)
+        except Exception as e:
+            self.logger.error("Failed to release dropped notification %s: %s", key, e)
+
+    async def flush(self) -> None:
+        """Publish everything still buffered at shutdown and wait for in-flight batches.
+
+        Messages awaiting a retry get one last attempt; whatever still fails is dropped.
+        """
+
+        self._closing = True
+        for handle in list(self._retrying):
+            handle.cancel()
+            self._pending.extend(self._retrying.pop(handle))
+        self._flush()
+        while self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks, return_exceptions=True)
+            self._flush()
@@ -0,0 +1,111 @@
+import asyncio
+import random
+import time
+from datetime import UTC, datetime, timedelta
+
+from src.config.logging import LoggerMixin
+from src.config.settings import get_settings
+from src.database.db import MongoDB
+from src.webhook.manager import WebSubManager
+
+
+class LeaseRenewalScheduler(LoggerMixin):
+    """Renews WebSub leases from the subscription registry before they expire.
+
+    Every `check_interval` seconds the scheduler looks for subscriptions whose
+    lease ends within `renew_before` seconds. Each renewal is delayed by a
+    random jitter (kept well ahead of the lease expiry) so channels that were
+    subscribed together do not all renew together, and hub requests are paced
+    to at most `websub_renewal_rate` per second.
+    """
+
+    def __init__(self, manager: WebSubManager, mongodb: MongoDB) -> None:
+        """Initialize the scheduler from the application settings."""
+
+        settings = get_settings()
+        self.manager = manager
+        self.mongodb = mongodb
+        self.check_interval = settings.websub_renewal_check_seconds
+        self.renew_before = timedelta(seconds=settings.websub_renew_before_seconds)
+        self.max_jitter = settings.websub_renewal_jitter_seconds
+        self.retry_after = timedelta(seconds=settings.websub_renewal_retry_seconds)
+        self.min_request_interval = 1 / settings.websub_renewal_rate
+        self._last_request_at = 0.0
+
+    async def run(self, stop_event: asyncio.Event) -> None:
+        """Run renewal passes until `stop_event` is set."""
+
+        self.logger.info("Lease renewal scheduler started.")
+        while not stop_event.is_set():
+            try:
+                await self.renew_due(stop_event)
+            except Exception as e:
+                self.logger.error("Lease renewal pass failed: %s", e)
+
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=self.check_interval)
+            except TimeoutError:
+                pass
+        self.logger.info("Lease renewal scheduler stopped.")
+
+    async def renew_due(self, stop_event: asyncio.Event) -> int:
+        """Renew every subscription that is due, returning how many were renewed."""
+
+        now = datetime.now(UTC)
+        due = await self.mongodb.find_subscriptions_due(
+            expires_before=now + self.renew_before,
+            requested_before=now - self.retry_after,
+        )
+        if not due:
+            return 0
+
+        self.logger.info("Scheduling renewal of %s subscriptions.", len(due))
+        schedule = sorted(
+            ((self._jitter(subscription, now), subscription) for subscription in due),
+            key=lambda item: item[0],
+        )
+
+        started = time.monotonic()
+        renewed = 0
+        for delay, subscription in schedule:
+            remaining = delay - (time.monotonic() - started)
+            if remaining > 0:
+                try:
+                    await asyncio.wait_for(stop_event.wait(), timeout=remaining)
+                except TimeoutError:
+                    pass
+            if stop_event.is_set():
+                break
+
+            if await self._renew(subscription, now):
+                renewed += 1
+
+        self.logger.info("Renewed %s of %s due subscriptions.", renewed, len(due))
+        return renewed
+
+    def _jitter(self, subscription: dict, now: datetime) -> float:
+        """Pick a random delay that still leaves half the remaining lease as margin."""
+
+        expires_at = subscription["lease_expires_at"]
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=UTC)
+        margin = max((expires_at - now).total_seconds() / 2, 0)
+        return random.uniform(0, min(self.max_jitter, margin))
+
+    async def _renew(self, subscription: dict, now: datetime) -> bool:
+        """Claim and renew one subscription, pacing hub requests."""
+
+        channel_id = subscription["channel_id"]
+        if not await self.mongodb.claim_subscription_renewal(channel_id, now - self.retry_after):
+            return False  # another scheduler instance got to it first
+
+        wait = self._last_request_at + self.min_request_interval - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        self._last_request_at = time.monotonic()
+
+        result = await self.manager.subscribe(channel_id)
+        if result.get("status") == "error":
+            self.logger.warning("Lease renewal failed for channel %s: %s", channel_id, result)
+            return False
+        return True
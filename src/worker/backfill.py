@@ -0,0 +1,153 @@
+"""Channel backfill through the uploads playlist.
+
+`search.list` costs 100 quota units per call and cannot page through a
+channel's history. Every channel has an uploads playlist instead, which
+`playlistItems.list` pages through 50 videos at a time for 1 unit per page;
+fetching the metadata of those 50 videos costs 1 more unit. A backfill of
+thousands of videos therefore costs a few dozen units.
+
+Progress is checkpointed per channel after each page is written, so an
+interrupted backfill resumes from the page it stopped at.
+
+Run `python -m src.worker.backfill CHANNEL_ID [--max-videos N] [--restart]`
+to backfill a channel from the command line.
+"""
+
+import argparse
+import asyncio
+import json
+
+from src.config.logging import LoggerMixin
+from src.database.db import MongoDB
+from src.worker.transformer import VideoTransformer
+from src.worker.youtube_client import YoutubeClient
+
+BACKFILL_MESSAGE_TYPE = "backfill"
+
+
+def backfill_message(channel_id: str, max_videos: int | None = None, restart: bool = False) -> str:
+    """Build the queue message that asks a worker to backfill a channel."""
+
+    return json.dumps(
+        {
+            "type": BACKFILL_MESSAGE_TYPE,
+            "channel_id": channel_id,
+            "max_videos": max_videos,
+            "restart": restart,
+        }
+    )
+
+
+class ChannelBackfill(LoggerMixin):
+    """Backfills a channel's uploaded videos into MongoDB with resumable checkpoints."""
+
+    def __init__(self, youtube_client: YoutubeClient, mongodb: MongoDB) -> None:
+        """Initialize the backfill with shared clients."""
+
+        self.youtube_client = youtube_client
+        self.mongodb = mongodb
+
+    async def run(
+        self, channel_id: str, max_videos: int | None = None, restart: bool = False
+    ) -> dict:
+        """Backfill a channel, resuming from its checkpoint unless `restart` is set.
+
+        With `max_videos`, the backfill stops after the page that reaches it
+        and can be resumed later. Returns the saved checkpoint fields.
+        """
+
+        checkpoint = None if restart else await self.mongodb.get_backfill_checkpoint(channel_id)
+        if checkpoint and checkpoint.get("status") == "complete":
+            self.logger.info("Backfill of channel %s is already complete.", channel_id)
+            return checkpoint
+
+        if checkpoint:
+            playlist_id = checkpoint["playlist_id"]
+            page_token = checkpoint.get("page_token")
+            videos_written = checkpoint.get("videos_written", 0)
+            self.logger.info(
+                "Resuming backfill of channel %s at %s videos.", channel_id, videos_written
+            )
+        else:
+            playlist_id = await self.youtube_client.get_uploads_playlist_id(channel_id)
+            if playlist_id is None:
+                raise ValueError(f"No uploads playlist found for channel {channel_id}")
+            page_token = None
+            videos_written = 0
+
+        progress = {
+            "playlist_id": playlist_id,
+            "page_token": page_token,
+            "videos_written": videos_written,
+            "status": "running",
+        }
+        await self.mongodb.save_backfill_checkpoint(channel_id, **progress)
+
+        written_this_run = 0
+        async for video_ids, next_page_token in self.youtube_client.iter_playlist_video_ids(
+            playlist_id, page_token
+        ):
+            written = await self._write_page(video_ids)
+            written_this_run += written
+            progress["videos_written"] += written
+            progress["page_token"] = next_page_token
+            progress["status"] = "running" if next_page_token else "complete"
+            await self.mongodb.save_backfill_checkpoint(channel_id, **progress)
+            if max_videos is not None and written_this_run >= max_videos:
+                break
+
+        if progress["status"] == "running":
+            progress["status"] = "paused"
+            await self.mongodb.save_backfill_checkpoint(channel_id, status="paused")
+        self.logger.info(
+            "Backfill of channel %s %s: %s videos written, %s in total.",
+            channel_id,
+            progress["status"],
+            written_this_run,
+            progress["videos_written"],
+        )
+        return progress
+
+    async def _write_page(self, video_ids: list[str]) -> int:
+        """Fetch, transform and upsert one page of videos, returning how many were written.
+
+        Raises if any write fails, so the page's checkpoint is not advanced.
+        """
+
+        metadata = await self.youtube_client.fetch_videos_metadata(video_ids)
+        records = VideoTransformer.transform_many(metadata.values())
+        results = await asyncio.gather(
+            *(self.mongodb.queue_video_upsert(record) for record in records)
+        )
+        errors = [result.error for result in results if not result.success]
+        if errors:
+            raise RuntimeError(
+                f"{len(errors)} of {len(records)} backfill upserts failed: {errors[0]}"
+            )
+        return len(records)
+
+
+async def _main(channel_id: str, max_videos: int | None, restart: bool) -> None:
+    mongodb = MongoDB()
+    youtube_client = YoutubeClient()
+    await mongodb.connect()
+    try:
+        await mongodb.ensure_indexes()
+        progress = await ChannelBackfill(youtube_client, mongodb).run(
+            channel_id, max_videos=max_videos, restart=restart
+        )
+        print(f"{channel_id}: {progress['status']}, {progress['videos_written']} videos written")
+    finally:
+        await youtube_client.close()
+        await mongodb.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("channel_id", help="YouTube channel ID (UC...)")
+    parser.add_argument("--max-videos", type=int, help="Stop after about this many videos")
+    parser.add_argument(
+        "--restart", action="store_true", help="Ignore the checkpoint and start over"
+    )
+    args = parser.parse_args()
+    asyncio.run(_main(args.channel_id, args.max_videos, args.restart))
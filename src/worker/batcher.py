@@ -0,0 +1,89 @@
+import asyncio
+
+from src.config.logging import LoggerMixin
+from src.worker.youtube_client import YoutubeClient
+
+
+class VideoMetadataBatcher(LoggerMixin):
+    """Coalesces concurrent single-video lookups into batched videos.list calls.
+
+    Callers await `fetch(video_id)` as if it were a single request. Lookups that
+    arrive within `window_seconds` of each other are gathered into one batch,
+    which is dispatched early once it reaches `max_batch_size` distinct IDs.
+
+    Lookups are made for notifications, which announce that a video changed,
+    so they bypass the client's per-video cache unless `use_cache` is set.
+    """
+
+    def __init__(
+        self,
+        client: YoutubeClient,
+        max_batch_size: int = YoutubeClient.MAX_IDS_PER_REQUEST,
+        window_seconds: float = 0.05,
+        use_cache: bool = False,
+    ) -> None:
+        """Initialize the batcher around a YouTube client."""
+
+        self.client = client
+        self.max_batch_size = min(max_batch_size, YoutubeClient.MAX_IDS_PER_REQUEST)
+        self.window_seconds = window_seconds
+        self.use_cache = use_cache
+        self._pending: dict[str, list[asyncio.Future]] = {}
+        self._flush_timer: asyncio.TimerHandle | None = None
+        self._dispatch_tasks: set[asyncio.Task] = set()
+
+    async def fetch(self, video_id: str) -> dict | None:
+        """Fetch metadata for a single video ID through the next batch."""
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault(video_id, []).append(future)
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_timer is None:
+            self._flush_timer = loop.call_later(self.window_seconds, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        """Hand the pending batch to a dispatch task."""
+
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, {}
+        task = asyncio.create_task(self._dispatch(batch))
+        self._dispatch_tasks.add(task)
+        task.add_done_callback(self._dispatch_tasks.discard)
+
+    async def _dispatch(self, batch: dict[str, list[asyncio.Future]]) -> None:
+        """Fetch a batch and resolve every waiting caller with its own result."""
+
+        try:
+            metadata = await self.client.fetch_videos_metadata(
+                batch.keys(), use_cache=self.use_cache
+            )
+        except Exception as e:
+            self.logger.error("Batched metadata fetch for %s videos failed: %s", len(batch), e)
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        for video_id, futures in batch.items():
+            for future in futures:
+                if not future.done():
+                    future.set_result(metadata.get(video_id))
+
+    async def close(self) -> None:
+        """Dispatch anything still pending and wait for in-flight batches."""
+
+        self._flush()
+        if self._dispatch_tasks:
+            await asyncio.gather(*self._dispatch_tasks, return_exceptions=True)
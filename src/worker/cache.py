@@ -0,0 +1,98 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(slots=True)
+class CacheEntry:
+    """A cached API response and the ETag it was served with."""
+
+    data: Any
+    etag: str | None
+    stored_at: float
+
+
+class ResponseCache:
+    """LRU cache of YouTube API responses with ETag revalidation.
+
+    Entries younger than `ttl_seconds` are served without a request. Older
+    entries are kept until evicted, so their ETag can be sent as
+    `If-None-Match` and a 304 answer can revive them. Hits and misses are
+    counted per lookup: a hit is served from the cache or revived by a 304,
+    a miss needs a full response.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 60) -> None:
+        """Initialize an empty cache."""
+
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[Any, CacheEntry] = OrderedDict()
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Any) -> CacheEntry | None:
+        """Get an entry, fresh or stale, marking it as recently used."""
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def get_fresh(self, key: Any) -> Any | None:
+        """Get the data of an entry that is still within its TTL, counting a hit."""
+
+        entry = self.get(key)
+        if entry is None or not self.is_fresh(entry):
+            return None
+        self.hits += 1
+        return entry.data
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """Check whether an entry may be served without revalidation."""
+
+        return time.monotonic() - entry.stored_at < self.ttl_seconds
+
+    def put(self, key: Any, data: Any, etag: str | None) -> None:
+        """Store a response, evicting the least recently used entries over the limit."""
+
+        self._entries[key] = CacheEntry(data, etag, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def record_miss(self) -> None:
+        """Count a lookup that needs a full response."""
+
+        self.misses += 1
+
+    def revalidated(self, key: Any) -> Any | None:
+        """Renew an entry after a 304 Not Modified answer and return its data."""
+
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        entry.stored_at = time.monotonic()
+        self.hits += 1
+        self.revalidations += 1
+        return entry.data
+
+    def stats(self) -> dict[str, int | float]:
+        """Get the hit/miss counters and the current size."""
+
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "revalidations": self.revalidations,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
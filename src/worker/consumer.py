@@ -1,12 +1,34 @@
 import asyncio
 import json
 import signal
-
-import boto3
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
 
 from src.config.logging import LoggerMixin, setup_logging
+from src.config.metrics import (
+    REGISTRY,
+    TRANSFORM_SECONDS,
+    WORKER_IN_FLIGHT,
+    WORKER_MESSAGE_SECONDS,
+    WORKER_MESSAGES,
+)
 from src.config.settings import get_settings
 from src.database.db import MongoDB
+from src.database.stats import STATS_FIELDS
+from src.messaging.dedup import DedupCache, Deduplicator, MongoDedupStore, notification_key
+from src.messaging.retry import (
+    PermanentMessageError,
+    RetryPolicy,
+    VisibilityHeartbeat,
+    receive_count,
+)
+from src.messaging.sqs import SQSClient, SQSDeleteBuffer
+from src.worker.backfill import BACKFILL_MESSAGE_TYPE, ChannelBackfill
+from src.worker.batcher import VideoMetadataBatcher
+from src.worker.pool import BoundedTaskPool
+from src.worker.quota import MongoQuotaStore, QuotaExceededError, QuotaTracker
+from src.worker.refresh import StatsRefreshScheduler
 from src.worker.transformer import VideoTransformer
 from src.worker.youtube_client import YoutubeClient
 
@@ -15,93 +37,254 @@ settings = get_settings()
 
 
 class Consumer(LoggerMixin):
-    def __init__(self) -> None:
-        self.youtube_client: YoutubeClient = YoutubeClient()
-        self.transformer: VideoTransformer = VideoTransformer()
+    def __init__(self, run_stats_refresh: bool = True) -> None:
+        self.run_stats_refresh = run_stats_refresh
+        self.pool: BoundedTaskPool = BoundedTaskPool(settings.consumer_concurrency)
         self.db: MongoDB = MongoDB()
+        self.youtube_client: YoutubeClient = YoutubeClient(
+            QuotaTracker(
+                settings.youtube_daily_quota,
+                settings.youtube_rate_limits,
+                burst=settings.youtube_rate_burst,
+                store=MongoQuotaStore(self.db) if settings.youtube_quota_shared else None,
+            )
+        )
+        self.metadata_batcher: VideoMetadataBatcher = VideoMetadataBatcher(
+            self.youtube_client,
+            max_batch_size=settings.youtube_batch_size,
+            window_seconds=settings.youtube_batch_window_ms / 1000,
+        )
+        self.transformer: VideoTransformer = VideoTransformer()
+        self.backfill: ChannelBackfill = ChannelBackfill(self.youtube_client, self.db)
+        self.deduplicator: Deduplicator = Deduplicator(
+            DedupCache(settings.dedup_cache_size, settings.dedup_ttl_seconds),
+            MongoDedupStore(self.db, scope="worker") if settings.dedup_shared_store else None,
+        )
 
         if settings.queue_provider == "sqs":
             self.logger.info("Using AWS SQS as the queue provider.")
-            self.sqs_client: boto3.client = boto3.client(
-                "sqs",
-                region_name=settings.aws_region,
-                aws_access_key_id=settings.aws_access_key_id,
-                aws_secret_access_key=settings.aws_secret_access_key,
+            self.sqs: SQSClient = SQSClient()
+            self.delete_buffer: SQSDeleteBuffer = SQSDeleteBuffer(
+                self.sqs, flush_interval=settings.sqs_delete_flush_ms / 1000
+            )
+            self.dead_letter_queue: SQSClient | None = (
+                SQSClient(settings.SQS_DLQ_URL) if settings.SQS_DLQ_URL else None
+            )
+            self._in_flight: set[str] = set()  # receipt handles being processed
+            self.retry_policy: RetryPolicy = RetryPolicy(
+                settings.sqs_max_receives,
+                settings.sqs_retry_base_seconds,
+                settings.sqs_retry_max_seconds,
             )
         else:
             raise ValueError("Unsupported queue provider specified.")
 
-    async def _receive_message_blocking(self, **kwargs):
-        """Run the blocking SQS receive_message in an executor."""
-
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, lambda: self.sqs_client.receive_message(**kwargs))
-
-    async def _delete_message_blocking(self, **kwargs):
-        """Run the blocking SQS delete_message in an executor."""
-
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, lambda: self.sqs_client.delete_message(**kwargs))
-
     async def _consume_sqs_messages(self, shutdown_event: asyncio.Event) -> None:
-        """Continuously poll SQS for messages and process them."""
+        """Continuously poll SQS and hand messages to the worker pool.
+
+        Each receive only asks for as many messages as the pool has free slots,
+        so a saturated pool pauses intake (backpressure). Messages are processed
+        in the background, which lets the next long poll overlap in-flight work.
+        While the YouTube API quota is exhausted, messages are left in the queue.
+        """
 
-        queue_url: str = settings.sqs_queue_url
         while not shutdown_event.is_set():
+            paused_until = self.youtube_client.quota.paused_until
+            if paused_until is not None:
+                remaining = (paused_until - datetime.now(UTC)).total_seconds()
+                try:
+                    await asyncio.wait_for(shutdown_event.wait(), timeout=min(remaining, 60))
+                except TimeoutError:
+                    pass
+                continue
+
+            slots = await self.pool.reserve(SQSClient.MAX_BATCH_SIZE)
+            if shutdown_event.is_set():
+                # Shutdown began while waiting for slots; do not start another poll
+                self.pool.release(slots)
+                break
             try:
-                response = await self._receive_message_blocking(
-                    QueueUrl=queue_url,
-                    MaxNumberOfMessages=10,
-                    WaitTimeSeconds=20,
+                messages = await self.sqs.receive_messages(
+                    max_messages=slots,
+                    wait_seconds=20,
+                    visibility_timeout=settings.sqs_visibility_timeout_seconds,
                 )
-
-                messages = response.get("Messages", [])
-                for message in messages:
-                    try:
-                        await self.process_message(
-                            json.loads(message["Body"]),
-                            message["ReceiptHandle"],
-                        )
-                        # delete in executor
-                        await self._delete_message_blocking(
-                            QueueUrl=queue_url,
-                            ReceiptHandle=message["ReceiptHandle"],
-                        )
-                    except Exception as e:
-                        self.logger.error(f"Error processing message: {e}")
-                        # optionally change visibility, send to DLQ etc.
-                        continue
             except Exception as e:
-                self.logger.error(f"Error receiving messages from SQS: {e}")
+                self.pool.release(slots)
+                self.logger.error("Error receiving messages from SQS: %s", e)
                 await asyncio.sleep(5)
+                continue
+
+            if shutdown_event.is_set():
+                # Received during the final long poll; let another worker have them
+                self.pool.release(slots)
+                await self._hand_back([message["ReceiptHandle"] for message in messages])
+                break
+
+            self.pool.release(slots - len(messages))
+            for message in messages:
+                self.pool.spawn(self._handle_message(message))
+
+    async def _handle_message(self, message: dict) -> None:
+        """Process a received SQS message, then delete, retry or dead-letter it.
+
+        A heartbeat keeps the message invisible while it is processed. On
+        success it is queued for deletion. A failed message is retried after
+        an exponential backoff, until it has been received `sqs_max_receives`
+        times or is known to be unprocessable; it is then dead-lettered.
+        """
+
+        receipt_handle = message["ReceiptHandle"]
+        receives = receive_count(message)
+        self._in_flight.add(receipt_handle)
+        WORKER_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        outcome = "cancelled"
+        try:
+            async with VisibilityHeartbeat(
+                self.sqs,
+                receipt_handle,
+                settings.sqs_visibility_timeout_seconds,
+                settings.sqs_heartbeat_seconds,
+            ):
+                try:
+                    body = json.loads(message["Body"])
+                except json.JSONDecodeError as e:
+                    raise PermanentMessageError(f"Malformed message body: {e}") from e
+                await self.process_message(body, receipt_handle)
+        except PermanentMessageError as e:
+            outcome = "dead_letter"
+            await self._dead_letter(message, e)
+        except QuotaExceededError as e:
+            # Not the message's fault, so retry it once the quota resets
+            outcome = "quota_delayed"
+            delay = (e.paused_until - datetime.now(UTC)).total_seconds()
+            await self._retry_later(receipt_handle, int(delay))
+        except Exception as e:
+            self.logger.error("Error processing message (receive %s): %s", receives, e)
+            if self.retry_policy.should_dead_letter(receives):
+                outcome = "dead_letter"
+                await self._dead_letter(message, e)
+            else:
+                outcome = "retry"
+                await self._retry_later(receipt_handle, self.retry_policy.backoff(receives))
+        else:
+            outcome = "success"
+            self.delete_buffer.delete(receipt_handle)
+        finally:
+            self._in_flight.discard(receipt_handle)
+            WORKER_IN_FLIGHT.dec()
+            WORKER_MESSAGES.inc(outcome=outcome)
+            WORKER_MESSAGE_SECONDS.observe(time.perf_counter() - start)
+
+    async def _hand_back(self, receipt_handles: list[str]) -> None:
+        """Make messages this consumer will not process visible again right away."""
+
+        if not receipt_handles:
+            return
+        try:
+            failed = await self.sqs.change_visibilities(receipt_handles, 0)
+        except Exception as e:
+            self.logger.error("Failed to hand back %s messages: %s", len(receipt_handles), e)
+            return
+        self.logger.info("Handed back %s unfinished messages.", len(receipt_handles) - len(failed))
+
+    async def _retry_later(self, receipt_handle: str, delay: int) -> None:
+        """Make a failed message visible again after `delay` seconds."""
+
+        try:
+            await self.sqs.change_visibility(receipt_handle, delay)
+        except Exception as e:
+            self.logger.error("Failed to delay retry of message: %s", e)
+
+    async def _dead_letter(self, message: dict, error: Exception) -> None:
+        """Move a message to the dead-letter queue, recording why it failed.
+
+        Without a dead-letter queue the message is only delayed as long as
+        the retry policy allows, leaving it to the queue's own redrive policy.
+        """
+
+        if self.dead_letter_queue is None:
+            self.logger.error("Giving up on message, but no SQS_DLQ_URL is set: %s", error)
+            await self._retry_later(message["ReceiptHandle"], self.retry_policy.max_delay)
+            return
+
+        try:
+            await self.dead_letter_queue.send_message(
+                message["Body"],
+                attributes={
+                    "error": str(error)[:1000] or type(error).__name__,
+                    "receive_count": str(receive_count(message)),
+                    "source_queue": self.sqs.queue_url,
+                },
+            )
+        except Exception as e:
+            self.logger.error("Failed to dead-letter message, leaving it queued: %s", e)
+            return
+        self.logger.warning("Moved message to the dead-letter queue: %s", error)
+        self.delete_buffer.delete(message["ReceiptHandle"])
 
     async def process_message(self, message: dict, receipt_handle: str) -> None:
         """Process a single SQS message."""
 
+        if message.get("type") == BACKFILL_MESSAGE_TYPE:
+            if not message.get("channel_id"):
+                raise PermanentMessageError("No channel_id found in backfill message.")
+            await self.backfill.run(
+                message["channel_id"],
+                max_videos=message.get("max_videos"),
+                restart=message.get("restart", False),
+            )
+            return
+
         try:
             self.logger.info("Processing video")
             video_id = message.get("video_id")
             if not video_id:
-                self.logger.error("No video_id found in message.")
+                raise PermanentMessageError("No video_id found in message.")
+
+            # Drop replays of a notification that was already processed
+            dedup_key = notification_key(video_id, message.get("updated"))
+            if await self.deduplicator.is_duplicate(dedup_key):
+                self.logger.info("Skipping duplicate notification for video_id: %s", video_id)
                 return
 
-            # Fetch video metadata from YouTube
-            video_data = await self.youtube_client.fetch_video_metadata(video_id=video_id)
+            if message.get("deleted"):
+                await self.db.mark_video_deleted(video_id)
+                await self.deduplicator.remember(dedup_key)
+                self.logger.info("Marked video_id %s as deleted", video_id)
+                return
+
+            # Fetch video metadata from YouTube, batched with concurrent lookups
+            video_data = await self.metadata_batcher.fetch(video_id)
             if not video_data:
-                self.logger.error(f"No data found for video_id: {video_id}")
+                self.logger.error("No data found for video_id: %s", video_id)
                 return
 
             # Transform the fetched video metadata
-            transformed_data = self.transformer.transform(
-                video_data)
-
-            # Upsert the transformed data into MongoDB
-            await self.db.upsert_video_data(transformed_data)
+            with TRANSFORM_SECONDS.time():
+                transformed_data = self.transformer.transform(video_data)
+
+            # Upsert the transformed data into MongoDB through the bulk writer
+            result = await self.db.queue_video_upsert(transformed_data)
+            if not result.success:
+                raise RuntimeError(f"Upsert failed for video_id {video_id}: {result.error}")
+
+            # Statistics history is best effort and must not fail the message
+            stats_result = await self.db.queue_stats_snapshot(
+                video_id,
+                {field: getattr(transformed_data, field) for field in STATS_FIELDS},
+                transformed_data.last_updated_at,
+            )
+            if not stats_result.success:
+                self.logger.warning(
+                    "Stats snapshot failed for video_id %s: %s", video_id, stats_result.error)
+            await self.deduplicator.remember(dedup_key)
 
-            self.logger.info(f"Successfully processed video_id: {video_id}")
+            self.logger.info("Successfully processed video_id: %s", video_id)
         except Exception as e:
             self.logger.error(
-                f"Error processing video_id {message.get('video_id')}: {e}")
+                "Error processing video_id %s: %s", message.get("video_id"), e)
             raise
 
     async def start(self, shutdown_event: asyncio.Event) -> None:
@@ -109,17 +292,84 @@ class Consumer(LoggerMixin):
 
         self.logger.info("Consumer started.")
         await self.db.connect()
-        await self._consume_sqs_messages(shutdown_event)
+        await self.db.ensure_indexes()
+        await self.sqs.connect()
+        tasks = [self._consume_sqs_messages(shutdown_event) for _ in range(settings.sqs_receivers)]
+        if settings.stats_refresh_enabled and self.run_stats_refresh:
+            tasks.append(StatsRefreshScheduler(self.youtube_client, self.db).run(shutdown_event))
+        await asyncio.gather(*tasks)
+
+    def status(self) -> dict:
+        """Get a snapshot of the consumer's state for health reporting."""
+
+        paused_until = self.youtube_client.quota.paused_until
+        return {
+            "in_flight": self.pool.in_flight,
+            "quota_paused_until": paused_until.isoformat() if paused_until else None,
+            "metrics": REGISTRY.collect(),
+        }
+
+    async def report_status(
+        self, report: Callable[[dict], None], shutdown_event: asyncio.Event
+    ) -> None:
+        """Pass the consumer's status to `report` periodically until shutdown."""
+
+        while not shutdown_event.is_set():
+            try:
+                report(self.status())
+            except Exception as e:
+                self.logger.warning("Failed to report consumer status: %s", e)
+            try:
+                await asyncio.wait_for(
+                    shutdown_event.wait(), timeout=settings.worker_status_interval_seconds
+                )
+            except TimeoutError:
+                pass
+
+    async def drain(self, timeout: float) -> None:
+        """Let in-flight messages finish for up to `timeout` seconds.
+
+        Messages still unfinished at the deadline are cancelled and handed
+        back with a visibility timeout of 0, so another worker picks them up
+        immediately instead of after the visibility timeout.
+        """
+
+        if self.pool.in_flight:
+            self.logger.info("Draining %s in-flight messages.", self.pool.in_flight)
+        if await self.pool.join(timeout):
+            return
+
+        unfinished = list(self._in_flight)
+        self.logger.warning("Drain deadline passed with %s messages unfinished.", len(unfinished))
+        await self.pool.cancel()
+        await self._hand_back(unfinished)
 
     async def stop(self) -> None:
         """Stop the consumer and clean up resources."""
 
         self.logger.info("Consumer stopping.")
+        await self.metadata_batcher.close()
+        await self.db.flush_writes()
+        await self.delete_buffer.flush()
+        await self.sqs.close()
+        if self.dead_letter_queue is not None:
+            await self.dead_letter_queue.close()
+        await self.youtube_client.close()
         await self.db.close()
 
 
-async def async_main():
-    consumer = Consumer()
+async def async_main(
+    report_status: Callable[[dict], None] | None = None, run_stats_refresh: bool = True
+) -> None:
+    """Run a consumer until SIGINT or SIGTERM, then drain it and shut down.
+
+    Under the supervisor, `report_status` receives the consumer's status
+    every `worker_status_interval_seconds`, and only one consumer runs the
+    statistics refresh; run standalone, a test message is sent on startup
+    instead.
+    """
+
+    consumer = Consumer(run_stats_refresh)
     shutdown_event = asyncio.Event()
 
     # simple signal handlers
@@ -130,30 +380,40 @@ async def async_main():
     # start consumer in background task (so we can also send test message)
     consumer_task = asyncio.create_task(consumer.start(shutdown_event))
 
-    # send a test message non-blocking (runs boto3 send_message in executor)
-    loop = asyncio.get_running_loop()
-
-    def send_msg():
-        return consumer.sqs_client.send_message(
-            QueueUrl=settings.sqs_queue_url,
-            MessageBody=json.dumps({"video_id": "CyYZ3adwboc"})
-        )
-    try:
-        await loop.run_in_executor(None, send_msg)
-    except Exception as e:
-        consumer.logger.error(f"Failed to send test message: {e}")
+    status_task = None
+    if report_status is not None:
+        status_task = asyncio.create_task(consumer.report_status(report_status, shutdown_event))
+    else:
+        # send a test message non-blocking
+        try:
+            await consumer.sqs.send_message(json.dumps({"video_id": "CyYZ3adwboc"}))
+        except Exception as e:
+            consumer.logger.error("Failed to send test message: %s", e)
 
-    # wait for shutdown signal
-    await shutdown_event.wait()
+    # wait for shutdown signal, or for the consumer to fail on its own
+    shutdown_wait = asyncio.create_task(shutdown_event.wait())
+    await asyncio.wait({consumer_task, shutdown_wait}, return_when=asyncio.FIRST_COMPLETED)
+    shutdown_event.set()
+    shutdown_wait.cancel()
 
-    # cancel/cleanup
-    consumer_task.cancel()
+    # drain: receivers stop after their current long poll, then in-flight
+    # messages get whatever is left of the deadline
+    deadline = loop.time() + settings.consumer_drain_seconds
     try:
-        await consumer_task
-    except asyncio.CancelledError:
-        pass
+        await asyncio.wait_for(consumer_task, timeout=settings.consumer_drain_seconds)
+    except TimeoutError:
+        consumer.logger.warning("Receivers did not stop before the drain deadline.")
+    except Exception as e:
+        consumer.logger.error("Consumer failed: %s", e)
+    await consumer.drain(max(deadline - loop.time(), 0))
+    if status_task is not None:
+        await status_task
     await consumer.stop()
 
+    # exit with an error when the consumer failed rather than being stopped
+    if not consumer_task.cancelled() and consumer_task.exception() is not None:
+        raise consumer_task.exception()
+
 
 if __name__ == "__main__":
     asyncio.run(async_main())
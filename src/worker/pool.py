@@ -0,0 +1,83 @@
+import asyncio
+from collections.abc import Coroutine
+from typing import Any
+
+from src.config.logging import LoggerMixin
+
+
+class BoundedTaskPool(LoggerMixin):
+    """Runs coroutines as tasks with a fixed upper bound on how many are in flight.
+
+    Producers reserve slots before pulling work so that a saturated pool stops
+    intake instead of buffering unbounded work: `reserve` blocks until at least
+    one slot is free, then greedily takes any other free slots up to the
+    requested amount. Each reserved slot is handed to one task via `spawn`, and
+    is released when that task finishes.
+    """
+
+    def __init__(self, max_concurrency: int) -> None:
+        """Initialize the pool with the maximum number of concurrent tasks."""
+
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1.")
+        self.max_concurrency = max_concurrency
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._tasks: set[asyncio.Task] = set()
+
+    @property
+    def in_flight(self) -> int:
+        """Number of tasks currently running in the pool."""
+
+        return len(self._tasks)
+
+    async def reserve(self, max_slots: int) -> int:
+        """Wait for a free slot, then reserve up to `max_slots` slots."""
+
+        await self._slots.acquire()
+        reserved = 1
+        while reserved < max_slots and not self._slots.locked():
+            await self._slots.acquire()
+            reserved += 1
+        return reserved
+
+    def release(self, count: int = 1) -> None:
+        """Give back reserved slots that were not used to spawn tasks."""
+
+        for _ in range(count):
+            self._slots.release()
+
+    def spawn(self, coro: Coroutine[Any, Any, Any]) -> asyncio.Task:
+        """Run a coroutine in a previously reserved slot."""
+
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._on_task_done)
+        return task
+
+    def _on_task_done(self, task: asyncio.Task) -> None:
+        """Free the task's slot and surface unexpected failures."""
+
+        self._tasks.discard(task)
+        self._slots.release()
+        if not task.cancelled() and task.exception() is not None:
+            self.logger.error("Pool task failed: %s", task.exception())
+
+    async def join(self, timeout: float | None = None) -> bool:
+        """Wait for every task in the pool to finish, returning False on timeout."""
+
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while self._tasks:
+            remaining = None if deadline is None else deadline - loop.time()
+            if remaining is not None and remaining <= 0:
+                return False
+            await asyncio.wait(self._tasks, timeout=remaining)
+        return True
+
+    async def cancel(self) -> None:
+        """Cancel every task in the pool and wait for them to unwind."""
+
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,249 @@
+"""Request rate limiting and quota accounting for the YouTube Data API.
+
+Every API call costs quota units from a daily budget that resets at midnight
+Pacific time (`search` costs 100 units, most list calls cost 1). Calls are
+paced by a token bucket per endpoint, and their cost is reserved from the
+budget before they are sent. When the budget runs out, or the API answers
+with quotaExceeded, further calls fail fast with QuotaExceededError until the
+next reset instead of being retried.
+
+The budget can be shared by several worker processes through MongoDB; the
+token buckets always pace a single process.
+"""
+
+import asyncio
+import time
+from collections import Counter
+from datetime import UTC, date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from src.config.logging import LoggerMixin
+from src.config.metrics import YOUTUBE_QUOTA_UNITS
+from src.database.db import MongoDB
+
+# Quota cost of one request, per endpoint
+ENDPOINT_COSTS = {"videos": 1, "channels": 1, "playlistItems": 1, "search": 100}
+DEFAULT_COST = 1
+
+# The daily quota resets at midnight in this timezone
+QUOTA_TIMEZONE = ZoneInfo("America/Los_Angeles")
+
+
+class QuotaExceededError(Exception):
+    """Raised when the daily YouTube API quota is spent or the API reports it is."""
+
+    def __init__(self, paused_until: datetime) -> None:
+        super().__init__(f"YouTube API quota exhausted until {paused_until.isoformat()}")
+        self.paused_until = paused_until
+
+
+def quota_day(now: datetime) -> date:
+    """Get the quota day a moment falls in."""
+
+    return now.astimezone(QUOTA_TIMEZONE).date()
+
+
+def next_quota_reset(now: datetime) -> datetime:
+    """Get the moment the quota day containing `now` ends."""
+
+    local = now.astimezone(QUOTA_TIMEZONE)
+    midnight = datetime.combine(local.date() + timedelta(days=1), datetime.min.time())
+    return midnight.replace(tzinfo=QUOTA_TIMEZONE).astimezone(UTC)
+
+
+class TokenBucket:
+    """Paces requests to `rate` per second with bursts of up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        """Initialize a full bucket."""
+
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("Token bucket rate and capacity must be positive.")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: float = 1) -> None:
+        """Wait until `tokens` are available and take them; waiters are served in order."""
+
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+
+class MongoQuotaStore(LoggerMixin):
+    """Daily quota usage shared between processes, stored in MongoDB.
+
+    There is one document per quota day holding the units used in total and
+    per endpoint, and whether the API reported the quota as exhausted.
+    """
+
+    COLLECTION = "youtube_quota"
+
+    def __init__(self, mongodb: MongoDB) -> None:
+        """Initialize the store."""
+
+        self.mongodb = mongodb
+
+    async def reserve(self, day: date, endpoint: str, cost: int, limit: int) -> bool:
+        """Atomically add `cost` units to a day's usage unless that would pass `limit`."""
+
+        collection = self.mongodb.db[self.COLLECTION]
+        query = {"_id": day.isoformat(), "exhausted": {"$ne": True}}
+        update = {"$inc": {"used": cost, f"endpoints.{endpoint}": cost}}
+        try:
+            document = await collection.find_one_and_update(
+                query, update, upsert=True, return_document=ReturnDocument.AFTER
+            )
+        except DuplicateKeyError:
+            # Either the day is marked exhausted, or another reserve created the
+            # day's document first; only the latter leaves room to retry
+            document = await collection.find_one_and_update(
+                query, update, return_document=ReturnDocument.AFTER
+            )
+            if document is None:
+                return False
+
+        if document["used"] > limit:
+            await collection.update_one(
+                {"_id": day.isoformat()},
+                {"$inc": {"used": -cost, f"endpoints.{endpoint}": -cost}},
+            )
+            return False
+        return True
+
+    async def mark_exhausted(self, day: date) -> None:
+        """Record that the API reported the quota of a day as exhausted."""
+
+        await self.mongodb.db[self.COLLECTION].update_one(
+            {"_id": day.isoformat()}, {"$set": {"exhausted": True}}, upsert=True
+        )
+
+    async def usage(self, day: date) -> dict:
+        """Get the recorded usage of a day."""
+
+        document = await self.mongodb.db[self.COLLECTION].find_one({"_id": day.isoformat()})
+        return document or {}
+
+
+class QuotaTracker(LoggerMixin):
+    """Paces YouTube API requests and accounts their cost against the daily quota."""
+
+    def __init__(
+        self,
+        daily_limit: int,
+        rate_limits: dict[str, float],
+        burst: int = 10,
+        store: MongoQuotaStore | None = None,
+    ) -> None:
+        """Initialize the tracker with one token bucket per rate-limited endpoint.
+
+        Endpoints missing from `rate_limits` share the bucket of the "default" key.
+        """
+
+        self.daily_limit = daily_limit
+        self.store = store
+        self._buckets = {
+            endpoint: TokenBucket(rate, burst) for endpoint, rate in rate_limits.items()
+        }
+        self._day: date | None = None
+        self._used: Counter[str] = Counter()
+        self._paused_until: datetime | None = None
+
+    @property
+    def paused_until(self) -> datetime | None:
+        """The time requests resume after the quota was exhausted, if it was."""
+
+        if self._paused_until is not None and self._paused_until <= datetime.now(UTC):
+            self._paused_until = None
+        return self._paused_until
+
+    async def acquire(self, endpoint: str) -> None:
+        """Reserve the cost of one request to `endpoint` and wait for its turn.
+
+        Raises QuotaExceededError without waiting when the quota is exhausted.
+        """
+
+        now = datetime.now(UTC)
+        if self.paused_until is not None:
+            raise QuotaExceededError(self._paused_until)
+
+        day = quota_day(now)
+        if day != self._day:
+            self._day = day
+            self._used.clear()
+
+        cost = ENDPOINT_COSTS.get(endpoint, DEFAULT_COST)
+        if self.store is not None:
+            reserved = await self.store.reserve(day, endpoint, cost, self.daily_limit)
+        else:
+            reserved = self._used.total() + cost <= self.daily_limit
+        if not reserved:
+            self._pause(now)
+            raise QuotaExceededError(self._paused_until)
+        self._used[endpoint] += cost
+        YOUTUBE_QUOTA_UNITS.inc(cost, endpoint=endpoint)
+
+        bucket = self._buckets.get(endpoint) or self._buckets.get("default")
+        if bucket is not None:
+            await bucket.acquire()
+
+    async def mark_exhausted(self) -> None:
+        """Pause requests until the next reset after the API reported quotaExceeded."""
+
+        now = datetime.now(UTC)
+        self._pause(now)
+        if self.store is not None:
+            await self.store.mark_exhausted(quota_day(now))
+
+    def _pause(self, now: datetime) -> None:
+        """Pause requests until the next quota reset, logging the first time."""
+
+        if self._paused_until is None:
+            self._paused_until = next_quota_reset(now)
+            self.logger.warning(
+                "YouTube API quota exhausted, pausing requests until %s",
+                self._paused_until.isoformat(),
+            )
+
+    async def usage(self) -> dict:
+        """Get the quota usage of the current day.
+
+        With a shared store, the day counts as exhausted when any process
+        recorded that the API reported it, or when its budget is spent.
+        """
+
+        now = datetime.now(UTC)
+        day = quota_day(now)
+        paused_until = self.paused_until
+        if self.store is not None:
+            document = await self.store.usage(day)
+            used, endpoints = document.get("used", 0), document.get("endpoints", {})
+            exhausted = bool(document.get("exhausted")) or used >= self.daily_limit
+            if exhausted and paused_until is None:
+                paused_until = next_quota_reset(now)
+        else:
+            used = self._used.total() if day == self._day else 0
+            endpoints = dict(self._used) if day == self._day else {}
+            exhausted = paused_until is not None
+        return {
+            "day": day.isoformat(),
+            "limit": self.daily_limit,
+            "used": used,
+            "remaining": max(self.daily_limit - used, 0),
+            "endpoints": endpoints,
+            "exhausted": exhausted,
+            "paused_until": paused_until,
+            "resets_at": next_quota_reset(now),
+        }
@@ -0,0 +1,123 @@
+import asyncio
+import math
+from datetime import UTC, date, datetime, timedelta
+
+from src.config.logging import LoggerMixin
+from src.config.settings import get_settings
+from src.database.db import MongoDB
+from src.database.stats import OLDEST_REFRESH_INTERVAL, next_refresh_at
+from src.worker.quota import quota_day
+from src.worker.youtube_client import YoutubeClient
+
+# Stored counter field -> key in the statistics part of a videos.list item
+_STATISTICS_KEYS = {
+    "view_count": "viewCount",
+    "like_count": "likeCount",
+    "comment_count": "commentCount",
+}
+
+
+class StatsRefreshScheduler(LoggerMixin):
+    """Periodically refreshes the statistics of stored videos.
+
+    Every video carries a `next_stats_refresh_at` that follows its age (see
+    REFRESH_TIERS), so new videos are polled often and old ones rarely. Each
+    pass claims the videos that are due and fetches them with
+    `part=statistics`, MAX_IDS_PER_REQUEST IDs per videos.list call (1 quota
+    unit each). Passes spend at most an even share of
+    `stats_refresh_daily_quota`, and nothing once the day's budget is spent;
+    videos left over simply stay due for the next pass.
+    """
+
+    def __init__(self, youtube_client: YoutubeClient, mongodb: MongoDB) -> None:
+        """Initialize the scheduler from the application settings."""
+
+        settings = get_settings()
+        self.youtube_client = youtube_client
+        self.mongodb = mongodb
+        self.check_interval = settings.stats_refresh_check_seconds
+        self.daily_quota = settings.stats_refresh_daily_quota
+        self.lease = timedelta(seconds=settings.stats_refresh_lease_seconds)
+        self.units_per_pass = max(1, math.ceil(self.daily_quota * self.check_interval / 86400))
+        self._quota_day: date | None = None
+        self._units_used = 0
+
+    @property
+    def units_remaining(self) -> int:
+        """Quota units left for the current quota day."""
+
+        if self._quota_day != quota_day(datetime.now(UTC)):
+            return self.daily_quota
+        return max(self.daily_quota - self._units_used, 0)
+
+    async def run(self, stop_event: asyncio.Event) -> None:
+        """Run refresh passes until `stop_event` is set."""
+
+        self.logger.info("Statistics refresh scheduler started.")
+        while not stop_event.is_set():
+            try:
+                await self.refresh_due()
+            except Exception as e:
+                self.logger.error("Statistics refresh pass failed: %s", e)
+
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=self.check_interval)
+            except TimeoutError:
+                pass
+        self.logger.info("Statistics refresh scheduler stopped.")
+
+    async def refresh_due(self) -> int:
+        """Refresh the videos that are due within this pass's budget, returning how many."""
+
+        # The budget resets with the API quota, at midnight Pacific time
+        now = datetime.now(UTC)
+        if self._quota_day != quota_day(now):
+            self._quota_day = quota_day(now)
+            self._units_used = 0
+
+        units = min(self.units_per_pass, self.units_remaining)
+        if units <= 0 or self.youtube_client.quota.paused_until is not None:
+            return 0
+
+        due = await self.mongodb.claim_videos_due_for_refresh(
+            now, self.lease, limit=units * YoutubeClient.MAX_IDS_PER_REQUEST
+        )
+        if not due:
+            return 0
+
+        video_ids = [video["video_id"] for video in due]
+        self._units_used += math.ceil(len(video_ids) / YoutubeClient.MAX_IDS_PER_REQUEST)
+        metadata = await self.youtube_client.fetch_videos_metadata(video_ids, part="statistics")
+
+        writes = []
+        for video in due:
+            item = metadata.get(video["video_id"])
+            if item is None:
+                continue
+            statistics = item.get("statistics", {})
+            counters = {
+                field: int(statistics.get(key, 0)) for field, key in _STATISTICS_KEYS.items()
+            }
+            writes.append(
+                self.mongodb.queue_stats_refresh(
+                    video["video_id"],
+                    counters,
+                    next_refresh_at(video.get("published_at") or now, now),
+                    now,
+                )
+            )
+        results = await asyncio.gather(*writes)
+
+        # Private or deleted videos return nothing; check them again rarely
+        missing = [video_id for video_id in video_ids if video_id not in metadata]
+        if missing:
+            await self.mongodb.defer_stats_refresh(missing, now + OLDEST_REFRESH_INTERVAL)
+
+        refreshed = sum(result.success for result in results)
+        self.logger.info(
+            "Refreshed statistics of %s of %s due videos (%s quota units left today).",
+            refreshed,
+            len(video_ids),
+            self.units_remaining,
+        )
+        return refreshed
@@ -0,0 +1,295 @@
+"""Multi-process supervisor for the worker.
+
+Run `python -m src.worker.supervisor [--processes N]` to start N consumer
+processes (one per CPU by default). Each child runs its own event loop with
+its own MongoDB pool, SQS receivers and YouTube client, so transformation,
+JSON decoding and logging are spread over all cores instead of contending for
+one GIL. Only the first child runs the statistics refresh, and with more than
+one process `youtube_quota_shared` is turned on (refusing to start if it was
+explicitly disabled), so the children share the daily YouTube API quota
+instead of each assuming all of it.
+
+The supervisor restarts children that crash, with a growing delay for
+children that keep crashing. On SIGINT or SIGTERM it forwards SIGTERM to every
+child, lets them drain, and kills those still running after the drain
+deadline. Children report their status and metrics over a queue, and each
+writes its own log files, tagged with its index.
+`GET /health` on `worker_health_port` aggregates the status: 200 while every
+child is alive and reporting, 503 otherwise. `GET /metrics` renders every
+child's metrics with a `worker` label.
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import queue
+import signal
+import time
+from datetime import UTC, datetime
+from multiprocessing.process import BaseProcess
+
+from src.config.logging import LoggerMixin, setup_logging
+from src.config.metrics import CONTENT_TYPE, render_many
+from src.config.settings import get_settings
+
+setup_logging()
+settings = get_settings()
+
+MAX_RESTART_DELAY = 60
+STABLE_AFTER_SECONDS = 60  # a child running this long resets its crash count
+
+
+def _run_child(index: int, status_queue: multiprocessing.Queue) -> None:
+    """Entry point of a consumer child process."""
+
+    # Rotating file handlers are not safe across processes, so each child
+    # writes its own files
+    setup_logging(file_tag=f"worker{index}")
+    from src.worker.consumer import async_main
+
+    def report(status: dict) -> None:
+        status_queue.put_nowait({**status, "index": index, "pid": os.getpid(), "at": time.time()})
+
+    try:
+        # The refresh budget is per process, so a single child spends it
+        asyncio.run(async_main(report, run_stats_refresh=index == 0))
+    finally:
+        # Reports are best effort; never wait at exit for the supervisor to read them
+        status_queue.cancel_join_thread()
+
+
+class _Child:
+    """Bookkeeping for one supervised consumer slot."""
+
+    def __init__(self, index: int) -> None:
+        self.index = index
+        self.process: BaseProcess | None = None
+        self.started_at = 0.0
+        self.restarts = 0
+        self.crashes = 0
+        self.restart_at: float | None = None
+        self.status: dict = {}
+
+
+class WorkerSupervisor(LoggerMixin):
+    """Runs, restarts and stops a fixed number of consumer processes."""
+
+    def __init__(self, processes: int, health_port: int) -> None:
+        """Initialize the supervisor without starting any process."""
+
+        self.processes = processes
+        self.health_port = health_port
+        self.status_interval = settings.worker_status_interval_seconds
+        self._context = multiprocessing.get_context("spawn")
+        self._status_queue = self._context.Queue()
+        self._children = [_Child(index) for index in range(processes)]
+        self._stopping = asyncio.Event()
+
+    def _start_child(self, child: _Child) -> None:
+        """Start the process of a slot."""
+
+        child.process = self._context.Process(
+            target=_run_child,
+            args=(child.index, self._status_queue),
+            name=f"consumer-{child.index}",
+        )
+        child.process.start()
+        child.started_at = time.monotonic()
+        child.restart_at = None
+        child.status = {}
+        self.logger.info("Started consumer %s (pid %s)", child.index, child.process.pid)
+
+    def _check_child(self, child: _Child) -> None:
+        """Schedule or perform the restart of a slot whose process exited."""
+
+        now = time.monotonic()
+        if child.restart_at is not None:
+            if now >= child.restart_at:
+                child.restarts += 1
+                self._start_child(child)
+            return
+
+        if child.process is None or child.process.is_alive():
+            return
+
+        if now - child.started_at >= STABLE_AFTER_SECONDS:
+            child.crashes = 0
+        child.crashes += 1
+        delay = min(2 ** (child.crashes - 1), MAX_RESTART_DELAY)
+        child.restart_at = now + delay
+        self.logger.error(
+            "Consumer %s (pid %s) exited with code %s; restarting in %ss",
+            child.index,
+            child.process.pid,
+            child.process.exitcode,
+            delay,
+        )
+
+    def _collect_statuses(self) -> None:
+        """Apply every status report waiting in the queue."""
+
+        while True:
+            try:
+                status = self._status_queue.get_nowait()
+            except queue.Empty:
+                return
+            child = self._children[status["index"]]
+            if child.process is not None and child.process.pid == status["pid"]:
+                child.status = status
+
+    def health(self) -> dict:
+        """Aggregate the health of every child."""
+
+        now = time.time()
+        workers = []
+        for child in self._children:
+            alive = child.process is not None and child.process.is_alive()
+            reported_at = child.status.get("at")
+            # A fresh child has a grace period before its first report is due
+            reporting = (
+                reported_at is not None and now - reported_at < 3 * self.status_interval
+            ) or time.monotonic() - child.started_at < 3 * self.status_interval
+            workers.append(
+                {
+                    "index": child.index,
+                    "pid": child.process.pid if child.process else None,
+                    "alive": alive,
+                    "healthy": alive and reporting,
+                    "restarts": child.restarts,
+                    "in_flight": child.status.get("in_flight"),
+                    "quota_paused_until": child.status.get("quota_paused_until"),
+                    "last_report_at": (
+                        datetime.fromtimestamp(reported_at, UTC).isoformat()
+                        if reported_at
+                        else None
+                    ),
+                }
+            )
+        healthy = all(worker["healthy"] for worker in workers) and not self._stopping.is_set()
+        return {
+            "status": "healthy" if healthy else "unhealthy",
+            "processes": self.processes,
+            "in_flight": sum(worker["in_flight"] or 0 for worker in workers),
+            "workers": workers,
+        }
+
+    def metrics(self) -> str:
+        """Render the metrics last reported by every child, labelled by worker index."""
+
+        return render_many(
+            (child.status.get("metrics", []), {"worker": str(child.index)})
+            for child in self._children
+        )
+
+    async def _handle_http(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve one request of the minimal health and metrics endpoint."""
+
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), timeout=5)
+            while (await asyncio.wait_for(reader.readline(), timeout=5)) not in (b"\r\n", b""):
+                pass  # skip headers
+            parts = request_line.decode("latin-1").split()
+            path = parts[1] if len(parts) > 1 else ""
+
+            content_type = "application/json"
+            if path == "/health":
+                health = self.health()
+                status = "200 OK" if health["status"] == "healthy" else "503 Service Unavailable"
+                body = json.dumps(health).encode()
+            elif path == "/metrics":
+                status, body, content_type = "200 OK", self.metrics().encode(), CONTENT_TYPE
+            else:
+                status, body = "404 Not Found", b'{"detail": "Not Found"}'
+
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode()
+                + body
+            )
+            await writer.drain()
+        except (TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _stop_children(self) -> None:
+        """Forward SIGTERM to every child and kill those that outlive the drain deadline."""
+
+        running = [
+            child.process
+            for child in self._children
+            if child.process is not None and child.process.is_alive()
+        ]
+        for process in running:
+            os.kill(process.pid, signal.SIGTERM)
+
+        # Receivers finish their long poll, then in-flight work gets the drain deadline
+        deadline = time.monotonic() + settings.consumer_drain_seconds + 30
+        while any(process.is_alive() for process in running) and time.monotonic() < deadline:
+            # Keep reading reports: a child cannot exit while its queue feeder
+            # is blocked on a full pipe
+            self._collect_statuses()
+            await asyncio.sleep(0.5)
+
+        for process in running:
+            if process.is_alive():
+                self.logger.warning("Killing consumer pid %s after drain deadline", process.pid)
+                process.kill()
+            process.join(timeout=5)
+
+    async def run(self) -> None:
+        """Run the children until SIGINT or SIGTERM, then stop them cleanly."""
+
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, self._stopping.set)
+
+        for child in self._children:
+            self._start_child(child)
+        server = await asyncio.start_server(self._handle_http, "0.0.0.0", self.health_port)
+        self.logger.info(
+            "Supervising %s consumers, health on port %s", self.processes, self.health_port
+        )
+
+        while not self._stopping.is_set():
+            self._collect_statuses()
+            for child in self._children:
+                self._check_child(child)
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=1)
+            except TimeoutError:
+                pass
+
+        self.logger.info("Supervisor stopping consumers.")
+        await self._stop_children()
+        server.close()
+        await server.wait_closed()
+        self._status_queue.close()
+        self.logger.info("Supervisor stopped.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=settings.worker_processes or os.cpu_count() or 1,
+        help="Number of consumer processes",
+    )
+    parser.add_argument(
+        "--health-port", type=int, default=settings.worker_health_port, help="Health port"
+    )
+    args = parser.parse_args()
+    if args.processes > 1 and not settings.youtube_quota_shared:
+        if "youtube_quota_shared" in settings.model_fields_set:
+            parser.error(
+                "running more than one process requires YOUTUBE_QUOTA_SHARED=true, "
+                "so the processes share the daily YouTube API quota"
+            )
+        # Children inherit the environment, so they all account quota in MongoDB
+        os.environ["YOUTUBE_QUOTA_SHARED"] = "true"
+    asyncio.run(WorkerSupervisor(args.processes, args.health_port).run())
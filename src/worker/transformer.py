@@ -1,73 +1,117 @@
 import re
-from datetime import datetime
+from collections.abc import Iterable
+from datetime import UTC, datetime
+
+from src.database.schemas import VideoRecord
+
+# C0 control characters (except tab, newline and carriage return) and DEL
+_CONTROL_CHARS = dict.fromkeys([*range(0x00, 0x09), 0x0B, 0x0C, *range(0x0E, 0x20), 0x7F])
+
+# ISO 8601 duration, e.g. PT4M13S, PT1H2M, P1DT2H or P0D for live streams
+_DURATION_PATTERN = re.compile(
+    r"P(?:(\d+)Y)?(?:(\d+)M)?(?:(\d+)W)?(?:(\d+)D)?"
+    r"(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+(?:\.\d+)?)S)?)?"
+)
+# Seconds per unit, in the order of the pattern's groups. Years and months
+# have no fixed length; YouTube never uses them for real videos, so they are
+# approximated as 365 and 30 days.
+_DURATION_UNITS = (365 * 86400, 30 * 86400, 7 * 86400, 86400, 3600, 60, 1)
+
+_THUMBNAIL_QUALITIES = ("maxres", "standard", "high", "medium", "default")
 
 
 class VideoTransformer:
     """Transforms raw video data into structured format."""
 
     @staticmethod
-    def transform(video_data: dict) -> dict:
-        """Transform raw video data into structured format."""
+    def transform(video_data: dict, now: datetime | None = None) -> VideoRecord:
+        """Transform raw video data into a VideoRecord.
+
+        `now` stamps the record's bookkeeping timestamps; it defaults to the
+        current time, and batches pass a single value for all their records.
+        """
+
+        if now is None:
+            now = datetime.now(UTC)
+
         snippet = video_data.get("snippet", {})
         statistics = video_data.get("statistics", {})
-        content_details = video_data.get("contentDetails", {})
+        clean_text = VideoTransformer._clean_text
 
-        return {
+        fields = {
             "video_id": video_data.get("id"),
-            "title": VideoTransformer._clean_text(snippet.get("title", "")),
-            "description": VideoTransformer._clean_text(snippet.get("description", "")),
-            "published_at": VideoTransformer._parse_datetime(snippet.get("publishedAt", "")),
-            "channel_id": snippet.get("channelId"),
-            "channel_title": VideoTransformer._clean_text(snippet.get("channelTitle", "")),
+            "title": clean_text(snippet.get("title", "")),
+            "description": clean_text(snippet.get("description", "")),
+            "published_at": VideoTransformer._parse_datetime(snippet.get("publishedAt", ""), now),
+            "channel_id": snippet.get("channelId", ""),
+            "channel_title": clean_text(snippet.get("channelTitle", "")),
             "thumbnail_url": VideoTransformer._get_thumbnail(snippet),
             "view_count": int(statistics.get("viewCount", 0)),
             "like_count": int(statistics.get("likeCount", 0)),
             "comment_count": int(statistics.get("commentCount", 0)),
             "duration_seconds": VideoTransformer._parse_duration(
-                content_details.get("duration", "")
+                video_data.get("contentDetails", {}).get("duration", "")
             ),
             "tags": snippet.get("tags", [])[:50],  # Limit to first 50 tags
             "category_id": snippet.get("categoryId", ""),
             "live_broadcast_content": snippet.get("liveBroadcastContent", "none"),
             "privacy_status": video_data.get("status", {}).get("privacyStatus", "public"),
-            "notification_received_at": datetime.utcnow(),
-            "last_updated_at": datetime.utcnow(),
-            "created_at": datetime.utcnow(),
+            "notification_received_at": now,
+            "last_updated_at": now,
+            "created_at": now,
         }
+        # Validation runs in pydantic-core and is cheaper than the pure Python
+        # model_construct, so even trusted API data goes through it.
+        return VideoRecord.model_validate(fields)
+
+    @staticmethod
+    def transform_many(items: Iterable[dict]) -> list[VideoRecord]:
+        """Transform every item of a videos.list response in one pass."""
+
+        now = datetime.now(UTC)
+        transform = VideoTransformer.transform
+        return [transform(item, now) for item in items]
 
     @staticmethod
     def _clean_text(text: str) -> str:
-        """Clean text by removing unwanted characters."""
+        """Clean text by removing control characters and collapsing whitespace."""
 
-        text = re.sub(r"[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]", "", text)
-        text = re.sub(r"\s+", " ", text).strip()
-        return text
+        if not text:
+            return ""
+        return " ".join(text.translate(_CONTROL_CHARS).split())
 
     @staticmethod
     def _parse_duration(duration: str) -> int:
         """Parse ISO 8601 duration to seconds."""
-        match = re.match(r"PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?", duration)
+
+        match = _DURATION_PATTERN.fullmatch(duration) if duration else None
         if not match:
             return 0
-        hours = int(match.group(1) or 0)
-        minutes = int(match.group(2) or 0)
-        seconds = int(match.group(3) or 0)
-        return hours * 3600 + minutes * 60 + seconds
+        return int(
+            sum(
+                float(value) * unit
+                for value, unit in zip(match.groups(), _DURATION_UNITS, strict=True)
+                if value
+            )
+        )
 
     @staticmethod
     def _get_thumbnail(snippet: dict) -> str | None:
         """Get the highest resolution thumbnail URL available."""
-        thumbnails = snippet.get("thumbnails", {})
-        for quality in ["maxres", "standard", "high", "medium", "default"]:
+
+        thumbnails = snippet.get("thumbnails")
+        if not thumbnails:
+            return None
+        for quality in _THUMBNAIL_QUALITIES:
             if quality in thumbnails:
                 return thumbnails[quality].get("url")
         return None
 
     @staticmethod
-    def _parse_datetime(datetime_str: str) -> datetime:
+    def _parse_datetime(datetime_str: str, default: datetime) -> datetime:
         """Parse ISO 8601 datetime string to datetime object."""
 
         try:
-            return datetime.fromisoformat(datetime_str.replace("Z", "+00:00"))
+            return datetime.fromisoformat(datetime_str)
         except ValueError:
-            return datetime.utcnow()
+            return default
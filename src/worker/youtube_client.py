@@ -1,10 +1,14 @@
 import asyncio
+from collections.abc import AsyncIterator, Iterable
 
 import httpx
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import retry, retry_if_not_exception_type, stop_after_attempt, wait_exponential
 
 from src.config.logging import LoggerMixin, setup_logging
+from src.config.metrics import YOUTUBE_CACHE_LOOKUPS, YOUTUBE_REQUEST_SECONDS, YOUTUBE_REQUESTS
 from src.config.settings import get_settings
+from src.worker.cache import ResponseCache
+from src.worker.quota import QuotaExceededError, QuotaTracker
 
 setup_logging()
 settings = get_settings()
@@ -14,9 +18,15 @@ class YoutubeClient(LoggerMixin):
     """API Client for fetching YouTube metadata."""
 
     BASE_URL = "https://www.googleapis.com/youtube/v3"
+    VIDEO_PARTS = "snippet,contentDetails,statistics"
+    MAX_IDS_PER_REQUEST = 50  # Hard limit of the videos.list `id` parameter
+    QUOTA_ERROR_REASONS = frozenset({"quotaExceeded", "dailyLimitExceeded"})
 
-    def __init__(self) -> None:
-        """Initialize the YouTube client."""
+    def __init__(self, quota: QuotaTracker | None = None) -> None:
+        """Initialize the YouTube client.
+
+        Without a `quota` tracker, a process-local one is built from the settings.
+        """
 
         self.api_key = settings.google_gemini_api_key
         if not self.api_key:
@@ -24,68 +34,249 @@ class YoutubeClient(LoggerMixin):
             raise ValueError("Google Gemini API key is required.")
         self.client = httpx.AsyncClient(base_url=self.BASE_URL)
         self._rate_limit_lock = asyncio.Semaphore(10)  # Limiting to 10 concurrent requests
+        self.quota = quota or QuotaTracker(
+            settings.youtube_daily_quota,
+            settings.youtube_rate_limits,
+            burst=settings.youtube_rate_burst,
+        )
+        self.cache = ResponseCache(settings.youtube_cache_size, settings.youtube_cache_ttl_seconds)
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
-    async def fetch_video_metadata(self, video_id: str) -> dict | None:
-        """Fetch metadata for a given YouTube video ID."""
+    async def _get(self, endpoint: str, params: dict, cache: bool = True) -> dict:
+        """Send a GET request to an API endpoint within the rate limit and quota.
+
+        Unless `cache` is False, responses are cached: a fresh cached response
+        is returned without a request, and a stale one is revalidated with
+        If-None-Match, so a 304 answer reuses it. A 403 whose reason is an
+        exhausted quota pauses the quota tracker and raises QuotaExceededError,
+        which is never retried.
+        """
+
+        key = (endpoint, tuple(sorted(params.items())))
+        headers = {}
+        if cache:
+            cached = self.cache.get_fresh(key)
+            if cached is not None:
+                YOUTUBE_CACHE_LOOKUPS.inc(kind="response", result="hit")
+                return cached
+            entry = self.cache.get(key)
+            if entry is not None and entry.etag:
+                headers["If-None-Match"] = entry.etag
 
+        await self.quota.acquire(endpoint)
         async with self._rate_limit_lock:
-            try:
+            with YOUTUBE_REQUEST_SECONDS.time(endpoint=endpoint):
                 response = await self.client.get(
-                    f"{self.BASE_URL}/videos",
-                    params={
-                        "part": "snippet,contentDetails,statistics",
-                        "id": video_id,
-                        "key": self.api_key,
-                    },
+                    f"{self.BASE_URL}/{endpoint}",
+                    params={**params, "key": self.api_key},
+                    headers=headers,
                     timeout=10.0,
                 )
-                response.raise_for_status()
-                data = response.json()
-                items = data.get("items", [])
-                if not items:
-                    self.logger.warning(f"No metadata found for video ID: {video_id}")
-                    return None
-                return items[0]
-            except httpx.HTTPStatusError as e:
-                self.logger.error(f"HTTP error while fetching video {video_id}: {e}")
-                raise
-            except httpx.RequestError as e:
-                self.logger.error(f"Request error while fetching video {video_id}: {e}")
-                raise
+        YOUTUBE_REQUESTS.inc(endpoint=endpoint, status=str(response.status_code))
+        if response.status_code == 304 and cache:
+            data = self.cache.revalidated(key)
+            if data is not None:
+                YOUTUBE_CACHE_LOOKUPS.inc(kind="response", result="revalidated")
+                return data
+        if response.status_code == 403 and self._is_quota_error(response):
+            await self.quota.mark_exhausted()
+            raise QuotaExceededError(self.quota.paused_until)
+        response.raise_for_status()
+
+        data = response.json()
+        if cache:
+            YOUTUBE_CACHE_LOOKUPS.inc(kind="response", result="miss")
+            self.cache.record_miss()
+            self.cache.put(key, data, response.headers.get("ETag") or data.get("etag"))
+        return data
+
+    def _is_quota_error(self, response: httpx.Response) -> bool:
+        """Check whether an error response reports an exhausted quota."""
+
+        try:
+            errors = response.json().get("error", {}).get("errors", [])
+        except ValueError:
+            return False
+        return any(error.get("reason") in self.QUOTA_ERROR_REASONS for error in errors)
+
+    async def quota_usage(self) -> dict:
+        """Get the quota usage of the current day."""
+
+        return await self.quota.usage()
+
+    def cache_stats(self) -> dict[str, int | float]:
+        """Get the hit/miss counters of the response cache."""
+
+        return self.cache.stats()
+
+    @retry(
+        retry=retry_if_not_exception_type(QuotaExceededError),
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+    )
+    async def _fetch_videos_chunk(self, video_ids: list[str], part: str) -> list[dict]:
+        """Fetch a single videos.list page for up to MAX_IDS_PER_REQUEST IDs.
+
+        The response is not cached as a whole: its items are cached per video
+        by `fetch_videos_metadata`, and the same ID list rarely comes back.
+        """
+
+        try:
+            data = await self._get(
+                "videos",
+                {"part": part, "id": ",".join(video_ids), "maxResults": len(video_ids)},
+                cache=False,
+            )
+            return data.get("items", [])
+        except httpx.HTTPStatusError as e:
+            self.logger.error("HTTP error while fetching %s videos: %s", len(video_ids), e)
+            raise
+        except httpx.RequestError as e:
+            self.logger.error("Request error while fetching %s videos: %s", len(video_ids), e)
+            raise
+
+    async def fetch_videos_metadata(
+        self, video_ids: Iterable[str], part: str = VIDEO_PARTS, use_cache: bool = True
+    ) -> dict[str, dict]:
+        """Fetch metadata for many YouTube video IDs, keyed by video ID.
+
+        IDs are de-duplicated and looked up in the cache, one entry per video.
+        The rest are collapsed into videos.list requests of up to
+        MAX_IDS_PER_REQUEST IDs each. Stale entries are fetched again in full:
+        a request for several IDs has one ETag, so items cannot be revalidated
+        one by one. IDs the API returns nothing for (private, deleted or
+        invalid videos) are absent from the result.
+
+        With `use_cache` False every ID is fetched, for callers that know the
+        video just changed; the fetched items still refresh the cache.
+        """
+
+        unique_ids = list(dict.fromkeys(video_id for video_id in video_ids if video_id))
+        if not unique_ids:
+            return {}
+
+        # Videos fetched recently with the same parts are served from the cache
+        metadata = {}
+        to_fetch = []
+        for video_id in unique_ids:
+            if not use_cache:
+                to_fetch.append(video_id)
+                continue
+            item = self.cache.get_fresh(("video", part, video_id))
+            if item is not None:
+                YOUTUBE_CACHE_LOOKUPS.inc(kind="video", result="hit")
+                metadata[video_id] = item
+            else:
+                YOUTUBE_CACHE_LOOKUPS.inc(kind="video", result="miss")
+                self.cache.record_miss()
+                to_fetch.append(video_id)
+
+        chunks = [
+            to_fetch[i : i + self.MAX_IDS_PER_REQUEST]
+            for i in range(0, len(to_fetch), self.MAX_IDS_PER_REQUEST)
+        ]
+        pages = await asyncio.gather(*(self._fetch_videos_chunk(chunk, part) for chunk in chunks))
+
+        for items in pages:
+            for item in items:
+                metadata[item["id"]] = item
+                self.cache.put(("video", part, item["id"]), item, None)
+        missing = len(unique_ids) - len(metadata)
+        if missing:
+            self.logger.warning(
+                "No metadata found for %s of %s video IDs", missing, len(unique_ids)
+            )
+        return metadata
+
+    async def fetch_video_metadata(self, video_id: str) -> dict | None:
+        """Fetch metadata for a given YouTube video ID."""
+
+        metadata = await self.fetch_videos_metadata([video_id])
+        return metadata.get(video_id)
+
+    @retry(
+        retry=retry_if_not_exception_type(QuotaExceededError),
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+    )
+    async def get_uploads_playlist_id(self, channel_id: str) -> str | None:
+        """Resolve the playlist holding every upload of a channel.
+
+        Falls back to the "UU" + channel suffix naming convention when the
+        API does not list the channel.
+        """
+
+        data = await self._get("channels", {"part": "contentDetails", "id": channel_id})
+        for item in data.get("items", []):
+            uploads = item.get("contentDetails", {}).get("relatedPlaylists", {}).get("uploads")
+            if uploads:
+                return uploads
+        if channel_id.startswith("UC"):
+            return f"UU{channel_id[2:]}"
+        return None
+
+    @retry(
+        retry=retry_if_not_exception_type(QuotaExceededError),
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+    )
+    async def _fetch_playlist_page(self, playlist_id: str, page_token: str | None) -> dict:
+        """Fetch one playlistItems.list page of up to MAX_IDS_PER_REQUEST items."""
+
+        params = {
+            "part": "contentDetails",
+            "playlistId": playlist_id,
+            "maxResults": self.MAX_IDS_PER_REQUEST,
+        }
+        if page_token:
+            params["pageToken"] = page_token
+        return await self._get("playlistItems", params)
+
+    async def iter_playlist_video_ids(
+        self, playlist_id: str, page_token: str | None = None
+    ) -> AsyncIterator[tuple[list[str], str | None]]:
+        """Page through a playlist, yielding each page's video IDs and the next page token.
+
+        Each page costs 1 quota unit. Passing a previously yielded token
+        resumes from that page; the last page yields None as its token.
+        """
+
+        while True:
+            data = await self._fetch_playlist_page(playlist_id, page_token)
+            video_ids = [
+                item["contentDetails"]["videoId"]
+                for item in data.get("items", [])
+                if "videoId" in item.get("contentDetails", {})
+            ]
+            page_token = data.get("nextPageToken")
+            yield video_ids, page_token
+            if not page_token:
+                return
 
     async def get_channel_videos(self, channel_id: str, max_results: int = 5) -> list[dict]:
         """Get a list of videos for a given channel ID."""
 
-        async with self._rate_limit_lock:
-            try:
-                response = await self.client.get(
-                    f"{self.BASE_URL}/search",
-                    params={
-                        "part": "snippet",
-                        "channelId": channel_id,
-                        "maxResults": max_results,
-                        "order": "date",
-                        "type": "video",
-                        "key": self.api_key,
-                    },
-                    timeout=10.0,
-                )
-                response.raise_for_status()
-                data = response.json()
-                return [
-                    item["id"]["videoId"]
-                    for item in data.get("items", [])
-                    if "videoId" in item["id"]
-                ]
-            except httpx.HTTPStatusError as e:
-                self.logger.error(f"HTTP error while fetching videos for channel {channel_id}: {e}")
-                raise
-            except httpx.RequestError as e:
-                self.logger.error(
-                    f"Request error while fetching videos for channel {channel_id}: {e}"
-                )
-                raise
+        try:
+            data = await self._get(
+                "search",
+                {
+                    "part": "snippet",
+                    "channelId": channel_id,
+                    "maxResults": max_results,
+                    "order": "date",
+                    "type": "video",
+                },
+            )
+            return [
+                item["id"]["videoId"] for item in data.get("items", []) if "videoId" in item["id"]
+            ]
+        except httpx.HTTPStatusError as e:
+            self.logger.error("HTTP error while fetching videos for channel %s: %s", channel_id, e)
+            raise
+        except httpx.RequestError as e:
+            self.logger.error(
+                "Request error while fetching videos for channel %s: %s", channel_id, e
+            )
+            raise
 
     async def close(self) -> None:
         """Close the HTTP client session."""